@@ -4,7 +4,7 @@ import {
   UserRound, FileText, ArrowLeft, Loader2, AlertCircle, ChevronDown, Calendar, Stethoscope, Download,
 } from 'lucide-react';
 import { patientApi, type Patient } from '../services/management';
-import { reportsApi, type Report } from '../services/reports';
+import { reportsApi, type ReportSummary } from '../services/reports';
 import { appointmentApi, type AppointmentWithDetails } from '../services/scheduling';
 
 export function PatientDetailPage() {
@@ -12,7 +12,7 @@ export function PatientDetailPage() {
   const id = patientId ? parseInt(patientId, 10) : NaN;
 
   const [patient, setPatient] = useState<Patient | null>(null);
-  const [reports, setReports] = useState<Report[]>([]);
+  const [reports, setReports] = useState<ReportSummary[]>([]);
   const [reportsTotal, setReportsTotal] = useState(0);
   const [upcomingAppointment, setUpcomingAppointment] = useState<AppointmentWithDetails | null>(null);
   const [loadingMoreReports, setLoadingMoreReports] = useState(false);
@@ -34,7 +34,7 @@ export function PatientDetailPage() {
     const to = new Date(now.getTime() + 30 * 24 * 60 * 60 * 1000).toISOString();
     Promise.all([
       patientApi.get(id).then(p => p),
-      reportsApi.list(id, { skip: 0, limit: 3 }),
+      reportsApi.listSummary(id, { skip: 0, limit: 3 }),
       appointmentApi.calendar({ from, to, patient_id: id }).catch(() => ({ items: [] as AppointmentWithDetails[], total: 0 })),
     ])
       .then(([p, res, cal]) => {
@@ -208,7 +208,7 @@ export function PatientDetailPage() {
                         {new Date(r.updated_at).toLocaleString()}
                       </span>
                     </div>
-                    <p className="text-sm text-gray-700 whitespace-pre-wrap line-clamp-2">{r.content}</p>
+                    <p className="text-sm text-gray-700 whitespace-pre-wrap line-clamp-2">{r.snippet}{r.snippet_truncated ? '…' : ''}</p>
                   </Link>
                   <div className="flex items-center gap-2 mt-1">
                     <Link to={`/dashboard/patients/${patient.id}/reports/${r.id}`} className="text-xs text-blue-600 hover:underline">
@@ -244,7 +244,7 @@ export function PatientDetailPage() {
                   if (!patient) return;
                   setLoadingMoreReports(true);
                   try {
-                    const res = await reportsApi.list(patient.id, { skip: reports.length, limit: 10 });
+                    const res = await reportsApi.listSummary(patient.id, { skip: reports.length, limit: 10 });
                     setReports(prev => [...prev, ...res.items]);
                   } finally {
                     setLoadingMoreReports(false);
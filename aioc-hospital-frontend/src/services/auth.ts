@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { type AxiosError, type InternalAxiosRequestConfig } from 'axios';
 
 // In local dev the Vite proxy forwards /api/* to localhost:8000, so base URL is ''.
 // In Docker (or any deployed env) VITE_API_URL is set at build time to the backend origin.
@@ -9,6 +9,8 @@ export type UserRole = 'user' | 'admin';
 export interface TokenResponse {
   access_token: string;
   token_type: string;
+  expires_in: number;
+  refresh_token: string;
   role: UserRole;
   username: string;
   full_name: string | null;
@@ -24,17 +26,91 @@ export interface UserInfo {
 
 const USER_TOKEN_KEY = 'hospital_user_token';
 const ADMIN_TOKEN_KEY = 'hospital_admin_token';
+const USER_REFRESH_KEY = 'hospital_user_refresh_token';
+const ADMIN_REFRESH_KEY = 'hospital_admin_refresh_token';
+
+interface Session {
+  tokenKey: string;
+  refreshKey: string;
+}
+
+const USER_SESSION: Session = { tokenKey: USER_TOKEN_KEY, refreshKey: USER_REFRESH_KEY };
+const ADMIN_SESSION: Session = { tokenKey: ADMIN_TOKEN_KEY, refreshKey: ADMIN_REFRESH_KEY };
+
+// Access token each session had before its last renewal: requests already in flight with it
+// retry with the new token instead of spending the (single-use) refresh token again.
+const previousToken = new Map<Session, string>();
+
+function storeTokens(session: Session, data: TokenResponse) {
+  const old = localStorage.getItem(session.tokenKey);
+  if (old) previousToken.set(session, old);
+  localStorage.setItem(session.tokenKey, data.access_token);
+  localStorage.setItem(session.refreshKey, data.refresh_token);
+}
+
+function endSession(session: Session) {
+  const refreshToken = localStorage.getItem(session.refreshKey);
+  localStorage.removeItem(session.tokenKey);
+  localStorage.removeItem(session.refreshKey);
+  if (refreshToken) {
+    axios.post(`${API_BASE}/api/auth/logout`, { refresh_token: refreshToken }).catch(() => undefined);
+  }
+}
+
+// Access tokens are short-lived. Refresh tokens are single use, so concurrent 401s share one refresh.
+const pendingRefresh = new Map<Session, Promise<string | null>>();
+
+function refreshAccessToken(session: Session): Promise<string | null> {
+  let pending = pendingRefresh.get(session);
+  if (!pending) {
+    const refreshToken = localStorage.getItem(session.refreshKey);
+    pending = (refreshToken
+      ? axios
+          .post<TokenResponse>(`${API_BASE}/api/auth/refresh`, { refresh_token: refreshToken })
+          .then(({ data }) => {
+            storeTokens(session, data);
+            return data.access_token;
+          })
+          .catch(() => null)
+      : Promise.resolve(null)
+    ).finally(() => pendingRefresh.delete(session));
+    pendingRefresh.set(session, pending);
+  }
+  return pending;
+}
+
+const retried = new WeakSet<InternalAxiosRequestConfig>();
+
+// Every service client sends `Bearer <token from localStorage>`; on 401, renew that session once and retry.
+axios.interceptors.response.use(undefined, async (error: AxiosError) => {
+  const config = error.config;
+  if (error.response?.status !== 401 || !config || retried.has(config) || config.url?.includes('/api/auth/')) {
+    throw error;
+  }
+  const sent = String(config.headers?.Authorization ?? '').replace(/^Bearer /, '');
+  for (const session of [ADMIN_SESSION, USER_SESSION]) {
+    let token: string | null;
+    if (localStorage.getItem(session.tokenKey) === sent) token = await refreshAccessToken(session);
+    else if (previousToken.get(session) === sent) token = localStorage.getItem(session.tokenKey);
+    else continue;
+    if (!token) throw error;
+    retried.add(config);
+    config.headers.Authorization = `Bearer ${token}`;
+    return axios(config);
+  }
+  throw error;
+});
 
 export const authService = {
   async loginUser(username: string, password: string): Promise<TokenResponse> {
     const { data } = await axios.post<TokenResponse>(`${API_BASE}/api/auth/login`, { username, password });
-    localStorage.setItem(USER_TOKEN_KEY, data.access_token);
+    storeTokens(USER_SESSION, data);
     return data;
   },
 
   async loginAdmin(username: string, password: string): Promise<TokenResponse> {
     const { data } = await axios.post<TokenResponse>(`${API_BASE}/api/auth/admin/login`, { username, password });
-    localStorage.setItem(ADMIN_TOKEN_KEY, data.access_token);
+    storeTokens(ADMIN_SESSION, data);
     return data;
   },
 
@@ -47,11 +123,11 @@ export const authService = {
   },
 
   logoutUser() {
-    localStorage.removeItem(USER_TOKEN_KEY);
+    endSession(USER_SESSION);
   },
 
   logoutAdmin() {
-    localStorage.removeItem(ADMIN_TOKEN_KEY);
+    endSession(ADMIN_SESSION);
   },
 
   async fetchUserInfo(): Promise<UserInfo> {
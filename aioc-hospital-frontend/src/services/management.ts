@@ -34,6 +34,19 @@ export interface PatientListResponse {
   total: number;
 }
 
+export interface PatientListParams {
+  search?: string;
+  is_active?: boolean;
+  /** ISO dates (YYYY-MM-DD), inclusive. */
+  born_from?: string;
+  born_to?: string;
+  /** Age in full years, inclusive. */
+  min_age?: number;
+  max_age?: number;
+  skip?: number;
+  limit?: number;
+}
+
 export interface PatientCreate {
   medical_record_number: string;
   first_name: string;
@@ -101,7 +114,7 @@ function patientAuthHeaders() {
 // ── Patient API ──────────────────────────────────────────────────────────────
 
 export const patientApi = {
-  async list(params?: { search?: string; is_active?: boolean; skip?: number; limit?: number }): Promise<PatientListResponse> {
+  async list(params?: PatientListParams): Promise<PatientListResponse> {
     const { data } = await axios.get(`${BASE}/api/patients`, {
       params,
       headers: patientAuthHeaders(),
@@ -21,6 +21,19 @@ export interface Report {
   created_by_id: number | null;
 }
 
+/** List projection returned by `fields=summary`: no therapy / lab exams, content cut to a snippet. */
+export interface ReportSummary {
+  id: number;
+  patient_id: number;
+  diagnosis_code: string | null;
+  referral_specialty: string | null;
+  created_at: string;
+  updated_at: string;
+  created_by_id: number | null;
+  snippet: string;
+  snippet_truncated: boolean;
+}
+
 export interface ReportCreate {
   diagnosis_code?: string;
   content: string;
@@ -46,6 +59,14 @@ export const reportsApi = {
     return data;
   },
 
+  async listSummary(patientId: number, params?: { skip?: number; limit?: number }): Promise<{ items: ReportSummary[]; total: number }> {
+    const { data } = await axios.get(`${BASE}/api/patients/${patientId}/reports`, {
+      params: { ...(params ?? {}), fields: 'summary' },
+      headers: authHeaders(),
+    });
+    return data;
+  },
+
   async create(patientId: number, body: ReportCreate): Promise<Report> {
     const { data } = await axios.post(`${BASE}/api/patients/${patientId}/reports`, body, {
       headers: authHeaders(),
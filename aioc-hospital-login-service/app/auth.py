@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -9,7 +10,9 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.database import get_db
+from app.hashing import HashPoolSaturated, HashPoolUnavailable, bcrypt_pool
 from app.models import User, UserRole
+from app.user_cache import user_cache
 
 bearer_scheme = HTTPBearer()
 
@@ -18,13 +21,43 @@ bearer_scheme = HTTPBearer()
 _DUMMY_HASH: str = bcrypt.hashpw(b"__dummy__", bcrypt.gensalt()).decode()
 
 
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, retry shortly",
+        headers={"Retry-After": str(settings.BCRYPT_RETRY_AFTER)},
+    )
+
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    try:
+        return bcrypt_pool.hash(password)
+    except (HashPoolSaturated, HashPoolUnavailable):
+        raise _hashing_unavailable()
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """hash_password for a batch, spread over every bcrypt worker."""
+    try:
+        return bcrypt_pool.hash_many(passwords)
+    except (HashPoolSaturated, HashPoolUnavailable):
+        raise _hashing_unavailable()
 
 
 def constant_time_verify(plain: str, hashed: str | None) -> bool:
     """Always runs bcrypt.checkpw — uses _DUMMY_HASH when no real hash is available."""
-    return bcrypt.checkpw(plain.encode(), (hashed or _DUMMY_HASH).encode())
+    try:
+        return bcrypt_pool.verify(plain, hashed or _DUMMY_HASH)
+    except (HashPoolSaturated, HashPoolUnavailable):
+        raise _hashing_unavailable()
+
+
+async def constant_time_verify_async(plain: str, hashed: str | None) -> bool:
+    """constant_time_verify for async handlers: waits without holding a threadpool thread."""
+    try:
+        return await bcrypt_pool.verify_async(plain, hashed or _DUMMY_HASH)
+    except (HashPoolSaturated, HashPoolUnavailable):
+        raise _hashing_unavailable()
 
 
 def create_access_token(data: dict) -> str:
@@ -32,7 +65,10 @@ def create_access_token(data: dict) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    payload.update({"exp": expire})
+    # iat lets the other services reject tokens issued before a revocation (app/revocations.py).
+    # A float keeps sub-second precision (a datetime is truncated to whole seconds), so a token
+    # issued right after a revocation in the same second is not caught by it.
+    payload.update({"iat": time.time(), "exp": expire})
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -56,9 +92,14 @@ def get_current_user(
     if not username:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+    user = user_cache.get(username)
+    if user is not None:
+        return user
+    version = user_cache.version
     user = db.query(User).filter(User.username == username, User.is_active == True).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user_cache.put(user, version)
     return user
 
 
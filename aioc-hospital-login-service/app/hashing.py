@@ -0,0 +1,217 @@
+"""Dedicated bcrypt executor with admission control.
+
+bcrypt is deliberately slow (~0.2 s per hash/verify). Run inline in sync handlers, a burst of
+logins occupies every threadpool thread and stalls unrelated routes, /health included. Hashes
+and verifies instead run on their own executor — worker processes, one per core by default
+(BCRYPT_BACKEND=thread uses threads; bcrypt releases the GIL, so they also run in parallel) —
+and at most workers + BCRYPT_MAX_QUEUE operations are admitted at once. Beyond that callers get
+HashPoolSaturated immediately, which the API maps to 503 + Retry-After, instead of queueing.
+
+hash_many() hashes a batch (bulk user provisioning) on all workers at once, but keeps at most
+`workers` of its operations admitted at a time, so logins arriving meanwhile queue behind at
+most one round of the batch instead of all of it.
+
+metrics() reports in-flight and queued operations, rejections, and latency (queue wait + hash)
+over the last few hundred operations.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import statistics
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Callable
+
+import bcrypt
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_WINDOW = 500
+
+
+def _percentile_ms(sorted_seconds: list[float], q: float) -> float | None:
+    if not sorted_seconds:
+        return None
+    return round(sorted_seconds[min(len(sorted_seconds) - 1, int(len(sorted_seconds) * q))] * 1000, 1)
+
+
+class HashPoolSaturated(Exception):
+    """All bcrypt workers are busy and the wait queue is full."""
+
+
+class HashPoolUnavailable(Exception):
+    """A worker died or the operation timed out."""
+
+
+def _hashpw(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class BcryptPool:
+    def __init__(self, backend: str, workers: int, max_queue: int, timeout: float):
+        self.backend = backend
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor: Executor | None = None
+        self._lock = Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)  # seconds
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _create_executor(self) -> Executor:
+        if self.backend == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def start(self) -> None:
+        self._executor = self._create_executor()
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> tuple[Executor, Future]:
+        """Admit and submit fn(*args); returns the executor it went to (for _restart) and its future."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise HashPoolSaturated()
+            self._in_flight += 1
+        started = time.monotonic()
+
+        def _done(_: Future) -> None:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._latencies.append(time.monotonic() - started)
+
+        executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError) as e:  # RuntimeError: replaced (shut down) meanwhile
+            with self._lock:
+                self._in_flight -= 1
+            self._restart(executor)
+            raise HashPoolUnavailable("bcrypt worker crashed") from e
+        future.add_done_callback(_done)
+        return executor, future
+
+    def _restart(self, broken: Executor) -> None:
+        """Replace `broken` — once: every operation in flight on it sees the same BrokenProcessPool."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            logger.warning("bcrypt pool broken; restarting workers")
+            self._executor = self._create_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool from sync code (inline if the pool is not started)."""
+        if self._executor is None:
+            return fn(*args)
+        executor, future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            raise HashPoolUnavailable("bcrypt operation timed out") from e
+        except BrokenProcessPool as e:
+            self._restart(executor)
+            raise HashPoolUnavailable("bcrypt worker crashed") from e
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool without holding a threadpool thread while waiting."""
+        if self._executor is None:
+            return fn(*args)
+        executor, future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError as e:
+            raise HashPoolUnavailable("bcrypt operation timed out") from e
+        except BrokenProcessPool as e:
+            self._restart(executor)
+            raise HashPoolUnavailable("bcrypt worker crashed") from e
+
+    def hash(self, password: str) -> str:
+        return self.run(_hashpw, password.encode()).decode()
+
+    async def hash_async(self, password: str) -> str:
+        return (await self.run_async(_hashpw, password.encode())).decode()
+
+    def hash_many(self, passwords: list[str]) -> list[str]:
+        """Hash passwords in parallel, in order; raises like hash() if any operation fails."""
+        if self._executor is None:
+            return [_hashpw(p.encode()).decode() for p in passwords]
+        results: list[str] = [""] * len(passwords)
+        pending: dict[Future, tuple[int, Executor]] = {}
+        queued = iter(enumerate(passwords))
+        try:
+            while True:
+                for i, password in queued:
+                    executor, future = self._submit(_hashpw, password.encode())
+                    pending[future] = i, executor
+                    if len(pending) >= self.workers:
+                        break
+                if not pending:
+                    return results
+                done, _ = wait(pending, timeout=self.timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    raise HashPoolUnavailable("bcrypt operation timed out")
+                for future in done:
+                    i, executor = pending.pop(future)
+                    try:
+                        results[i] = future.result().decode()
+                    except BrokenProcessPool as e:
+                        self._restart(executor)
+                        raise HashPoolUnavailable("bcrypt worker crashed") from e
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def verify(self, plain: str, hashed: str) -> bool:
+        return self.run(_checkpw, plain.encode(), hashed.encode())
+
+    async def verify_async(self, plain: str, hashed: str) -> bool:
+        return await self.run_async(_checkpw, plain.encode(), hashed.encode())
+
+    def metrics(self) -> dict:
+        with self._lock:
+            in_flight, completed, rejected = self._in_flight, self._completed, self._rejected
+            latencies = sorted(self._latencies)
+        return {
+            "backend": self.backend,
+            "workers": self.workers,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            "capacity": self.capacity,
+            "completed": completed,
+            "rejected": rejected,
+            "latency_ms_mean": round(statistics.fmean(latencies) * 1000, 1) if latencies else None,
+            "latency_ms_p50": _percentile_ms(latencies, 0.5),
+            "latency_ms_p95": _percentile_ms(latencies, 0.95),
+        }
+
+
+bcrypt_pool = BcryptPool(
+    backend=settings.BCRYPT_BACKEND,
+    workers=settings.BCRYPT_WORKERS,
+    max_queue=settings.BCRYPT_MAX_QUEUE,
+    timeout=settings.BCRYPT_TIMEOUT,
+)
@@ -9,8 +9,10 @@ from sqlalchemy import text
 
 from app.config import settings
 from app.database import SessionLocal, get_db
+from app.hashing import bcrypt_pool
+from app.user_cache import user_cache
 from app.middleware import RequestIDMiddleware
-from app.routes import auth, dashboard, users
+from app.routes import auth, dashboard, internal, users
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,6 +21,7 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting AIOC Hospital Login Service…")
+    bcrypt_pool.start()
 
     if settings.SEED_DEFAULT_USERS:
         from app.seed import seed_default_users
@@ -31,6 +34,7 @@ async def lifespan(app: FastAPI):
         logger.info("Default user seeding is disabled (SEED_DEFAULT_USERS=false).")
 
     yield
+    bcrypt_pool.stop()
 
 
 app = FastAPI(
@@ -51,6 +55,7 @@ app.add_middleware(
 
 app.include_router(auth.router)
 app.include_router(dashboard.router)
+app.include_router(internal.router)
 app.include_router(users.router)
 
 
@@ -59,7 +64,7 @@ def health(db: Session = Depends(get_db)):
     try:
         r = db.execute(text("SELECT current_database()"))
         db_name = r.scalar()
-        return {"status": "ok", "database": db_name}
+        return {"status": "ok", "database": db_name, "bcrypt": bcrypt_pool.metrics(), "user_cache": user_cache.stats()}
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -1,4 +1,6 @@
-from sqlalchemy import Boolean, Column, Integer, String, Enum
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Enum
 from app.database import Base
 import enum
 
@@ -17,3 +19,26 @@ class User(Base):
     role = Column(Enum(UserRole), nullable=False, default=UserRole.user)
     is_active = Column(Boolean, default=True)
     full_name = Column(String, nullable=True)
+
+
+class RefreshToken(Base):
+    """One refresh token (stored as its SHA-256). Rotation chains tokens of one login in a family."""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False)  # idle expiry, pushed forward by each rotation
+    session_expires_at = Column(DateTime, nullable=False)  # absolute cap for the whole family
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+class TokenRevocation(Base):
+    """Access tokens of user_id issued at or before revoked_at are no longer valid anywhere."""
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    revoked_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,107 @@
+"""Refresh tokens: short-lived access tokens without repeated bcrypt logins.
+
+A login (the only place a password is verified) returns a short-lived JWT access token and an
+opaque refresh token. POST /api/auth/refresh trades the refresh token for a new pair — one
+indexed lookup and one insert, no bcrypt. Each refresh token is single use (rotation):
+
+- expiry slides: a rotated token is valid for REFRESH_TOKEN_IDLE_MINUTES from its issue, but
+  never beyond REFRESH_TOKEN_MAX_DAYS after the login that started the family;
+- presenting an already-rotated token means it leaked (or was replayed), so the whole family
+  is revoked and both holders must log in again;
+- logout, password reset, deactivation and delete revoke tokens server-side; rotation also
+  re-checks that the user is still active and takes the role from the database.
+"""
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import RefreshToken, User
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _invalid() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+    )
+
+
+def issue_refresh_token(
+    db: Session,
+    user: User,
+    family_id: str | None = None,
+    session_expires_at: datetime | None = None,
+) -> str:
+    """Add a refresh token row for user (a new family unless family_id is given); caller commits."""
+    now = datetime.utcnow()
+    if session_expires_at is None:
+        session_expires_at = now + timedelta(days=settings.REFRESH_TOKEN_MAX_DAYS)
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user.id,
+        token_hash=_digest(token),
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=min(now + timedelta(minutes=settings.REFRESH_TOKEN_IDLE_MINUTES), session_expires_at),
+        session_expires_at=session_expires_at,
+        created_at=now,
+    ))
+    return token
+
+
+def rotate_refresh_token(db: Session, token: str) -> tuple[User, str]:
+    """Revoke token and issue its successor in the same family. Commits; raises 401 if not usable."""
+    row = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.token_hash == _digest(token))
+        .with_for_update()
+        .first()
+    )
+    if row is None:
+        raise _invalid()
+    now = datetime.utcnow()
+    if row.revoked_at is not None:
+        _revoke(db, RefreshToken.family_id == row.family_id, now)
+        db.commit()
+        raise _invalid()
+    user = db.query(User).filter(User.id == row.user_id, User.is_active == True).first()
+    if row.expires_at <= now or user is None:
+        row.revoked_at = now
+        db.commit()
+        raise _invalid()
+    row.revoked_at = now
+    new_token = issue_refresh_token(db, user, row.family_id, row.session_expires_at)
+    db.commit()
+    return user, new_token
+
+
+def _revoke(db: Session, condition, now: datetime | None = None) -> None:
+    db.query(RefreshToken).filter(condition, RefreshToken.revoked_at.is_(None)).update(
+        {RefreshToken.revoked_at: now or datetime.utcnow()}, synchronize_session=False,
+    )
+
+
+def revoke_refresh_family(db: Session, token: str) -> None:
+    """Logout: revoke the session the token belongs to (unknown tokens are ignored). Caller commits."""
+    row = db.query(RefreshToken.family_id).filter(RefreshToken.token_hash == _digest(token)).first()
+    if row is not None:
+        _revoke(db, RefreshToken.family_id == row.family_id)
+
+
+def revoke_user_refresh_tokens(db: Session, user_id: int) -> None:
+    """Revoke every session of a user. Caller commits."""
+    _revoke(db, RefreshToken.user_id == user_id)
+
+
+def purge_expired_refresh_tokens(db: Session, user_id: int) -> None:
+    """Delete a user's expired rows (run at login so the table does not grow without bound). Caller commits."""
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id, RefreshToken.expires_at <= datetime.utcnow(),
+    ).delete(synchronize_session=False)
@@ -0,0 +1,58 @@
+"""Access-token revocations, published to the other services.
+
+Access tokens are verified statelessly by management, scheduling and reports, so deactivating a
+user (or resetting their password, changing their role, deleting them) would leave already
+issued tokens usable until they expire. Those changes record a revocation instead: every access
+token of the user issued at or before `revoked_at` is invalid. The other services poll
+GET /internal/revocations and keep the recent revocations in memory (app/revocations.py there),
+so the check costs a dict lookup per request and no network call.
+
+A revocation only matters while tokens issued before it can still be unexpired, i.e. for
+ACCESS_TOKEN_EXPIRE_MINUTES; older rows are never served and are deleted as new ones are added.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import TokenRevocation
+
+# Polls ask for rows added since their previous as_of; rows are re-sent for this long past it so
+# a revocation whose transaction committed just after a poll started is not missed.
+_FEED_OVERLAP = timedelta(seconds=5)
+
+
+def _horizon() -> timedelta:
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def record_revocation(db: Session, user_id: int) -> None:
+    """Revoke every access token issued to user_id so far. Caller commits."""
+    now = datetime.utcnow()
+    db.query(TokenRevocation).filter(TokenRevocation.revoked_at < now - _horizon()).delete(
+        synchronize_session=False,
+    )
+    db.add(TokenRevocation(user_id=user_id, revoked_at=now))
+
+
+def revocation_feed(db: Session, since: float | None) -> dict:
+    """Revocations added since `since` (an earlier as_of; None for all that still matter)."""
+    now = datetime.utcnow()
+    start = now - _horizon()
+    if since is not None:
+        start = max(start, datetime.utcfromtimestamp(since) - _FEED_OVERLAP)
+    rows = (
+        db.query(TokenRevocation.user_id, TokenRevocation.revoked_at)
+        .filter(TokenRevocation.revoked_at >= start)
+        .order_by(TokenRevocation.revoked_at)
+        .all()
+    )
+    return {
+        "as_of": _epoch(now),
+        "horizon_seconds": int(_horizon().total_seconds()),
+        "revocations": [{"user_id": r.user_id, "revoked_at": _epoch(r.revoked_at)} for r in rows],
+    }
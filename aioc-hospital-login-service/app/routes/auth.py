@@ -1,23 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import User, UserRole
-from app.schemas import LoginRequest, TokenResponse
-from app.auth import constant_time_verify, create_access_token
+from app.schemas import LoginRequest, RefreshRequest, TokenResponse
+from app.auth import constant_time_verify_async, create_access_token
+from app.config import settings
+from app.refresh_tokens import (
+    issue_refresh_token,
+    purge_expired_refresh_tokens,
+    revoke_refresh_family,
+    rotate_refresh_token,
+)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
-def _authenticate(username: str, password: str, role: UserRole, db: Session) -> User:
-    user = (
+def _find_active_user(username: str, role: UserRole, db: Session) -> User | None:
+    return (
         db.query(User)
         .filter(User.username == username, User.role == role, User.is_active == True)
         .first()
     )
+
+
+async def _authenticate(username: str, password: str, role: UserRole, db: Session) -> User:
+    # Login handlers are async so that the bcrypt wait runs on the bcrypt pool without holding
+    # one of the threadpool threads that every other (sync) route needs.
+    user = await run_in_threadpool(_find_active_user, username, role, db)
     # Always verify — even when user is None — so response time doesn't leak
     # whether the username exists.
-    password_ok = constant_time_verify(password, user.hashed_password if user else None)
+    password_ok = await constant_time_verify_async(password, user.hashed_password if user else None)
     if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -26,25 +40,45 @@ def _authenticate(username: str, password: str, role: UserRole, db: Session) ->
     return user
 
 
-@router.post("/login", response_model=TokenResponse)
-def user_login(body: LoginRequest, db: Session = Depends(get_db)):
-    user = _authenticate(body.username, body.password, UserRole.user, db)
-    token = create_access_token({"sub": user.username, "role": user.role, "id": user.id})
+def _start_session(user: User, db: Session) -> str:
+    purge_expired_refresh_tokens(db, user.id)
+    token = issue_refresh_token(db, user)
+    db.commit()
+    return token
+
+
+def _token_response(user: User, refresh_token: str) -> TokenResponse:
     return TokenResponse(
-        access_token=token,
+        access_token=create_access_token({"sub": user.username, "role": user.role, "id": user.id}),
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        refresh_token=refresh_token,
         role=user.role,
         username=user.username,
         full_name=user.full_name,
     )
 
 
+@router.post("/login", response_model=TokenResponse)
+async def user_login(body: LoginRequest, db: Session = Depends(get_db)):
+    user = await _authenticate(body.username, body.password, UserRole.user, db)
+    return _token_response(user, await run_in_threadpool(_start_session, user, db))
+
+
 @router.post("/admin/login", response_model=TokenResponse)
-def admin_login(body: LoginRequest, db: Session = Depends(get_db)):
-    user = _authenticate(body.username, body.password, UserRole.admin, db)
-    token = create_access_token({"sub": user.username, "role": user.role, "id": user.id})
-    return TokenResponse(
-        access_token=token,
-        role=user.role,
-        username=user.username,
-        full_name=user.full_name,
-    )
+async def admin_login(body: LoginRequest, db: Session = Depends(get_db)):
+    user = await _authenticate(body.username, body.password, UserRole.admin, db)
+    return _token_response(user, await run_in_threadpool(_start_session, user, db))
+
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    """Trade a refresh token for a new access + refresh token pair (the old refresh token is spent)."""
+    user, refresh_token = rotate_refresh_token(db, body.refresh_token)
+    return _token_response(user, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(body: RefreshRequest, db: Session = Depends(get_db)):
+    """End the session the refresh token belongs to. Access tokens already issued run out on their own."""
+    revoke_refresh_family(db, body.refresh_token)
+    db.commit()
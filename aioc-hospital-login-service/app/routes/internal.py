@@ -0,0 +1,38 @@
+"""Internal API for other services. Protected by X-Internal-Key when INTERNAL_API_KEY is set."""
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+
+from app.config import settings
+from app.database import get_db
+from app.revocations import revocation_feed
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+class Revocation(BaseModel):
+    user_id: int
+    revoked_at: float  # unix time; the user's access tokens with iat <= revoked_at are revoked
+
+
+class RevocationFeed(BaseModel):
+    as_of: float  # pass back as ?since= on the next poll
+    horizon_seconds: int  # a revocation can be forgotten this long after revoked_at
+    revocations: list[Revocation]
+
+
+def _require_internal_key(x_internal_key: str | None = Header(default=None, alias="X-Internal-Key")):
+    key = (settings.INTERNAL_API_KEY or "").strip()
+    if key and x_internal_key != key:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing internal key")
+    return True
+
+
+@router.get("/revocations", response_model=RevocationFeed)
+def get_revocations(
+    since: float | None = Query(default=None),
+    db: Session = Depends(get_db),
+    _: bool = Depends(_require_internal_key),
+):
+    """Token revocations added since the previous poll (all still-relevant ones without `since`)."""
+    return revocation_feed(db, since)
@@ -1,11 +1,25 @@
 """User CRUD for admin. Login service owns the users table."""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import User, UserRole
-from app.schemas import UserCreate, UserUpdate, UserPasswordUpdate, UserResponse, UserListResponse
-from app.auth import require_role, get_current_user, hash_password
+from app.config import settings
+from app.schemas import (
+    UserBulkConflict,
+    UserBulkCreate,
+    UserBulkCreateResponse,
+    UserCreate,
+    UserListResponse,
+    UserPasswordUpdate,
+    UserResponse,
+    UserUpdate,
+)
+from app.auth import require_role, get_current_user, hash_password, hash_passwords
+from app.refresh_tokens import revoke_user_refresh_tokens
+from app.revocations import record_revocation
+from app.user_cache import user_cache
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
@@ -54,6 +68,62 @@ def create_user(
     return user
 
 
+@router.post("/bulk", response_model=UserBulkCreateResponse)
+def create_users_bulk(
+    body: UserBulkCreate,
+    db: Session = Depends(get_db),
+    _: User = Depends(_admin_only),
+):
+    """Create many users at once (e.g. a new department). Usernames that already exist or repeat
+    within the batch are reported as conflicts and skipped; the rest are hashed in parallel and
+    inserted in one transaction."""
+    if len(body.users) > settings.USER_BULK_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.USER_BULK_MAX} users per request",
+        )
+    requested = [u.username for u in body.users]
+    existing = {
+        name for (name,) in db.query(User.username).filter(User.username.in_(requested)).all()
+    }
+    conflicts: list[UserBulkConflict] = []
+    accepted: list[UserCreate] = []
+    seen: set[str] = set()
+    for item in body.users:
+        if item.username in existing:
+            conflicts.append(UserBulkConflict(username=item.username, reason="exists"))
+        elif item.username in seen:
+            conflicts.append(UserBulkConflict(username=item.username, reason="duplicate"))
+        else:
+            seen.add(item.username)
+            accepted.append(item)
+
+    hashes = hash_passwords([item.password for item in accepted])
+    users = [
+        User(
+            username=item.username,
+            hashed_password=hashed,
+            role=item.role,
+            full_name=item.full_name or None,
+            is_active=True,
+        )
+        for item, hashed in zip(accepted, hashes)
+    ]
+    db.add_all(users)
+    try:
+        db.flush()
+        created = [UserResponse.model_validate(user) for user in users]
+        db.commit()
+    except IntegrityError:
+        # A username was taken by a concurrent request after the conflict check.
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Usernames changed concurrently; nothing was created, retry the batch",
+        )
+    return UserBulkCreateResponse(created=created, conflicts=conflicts)
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
@@ -82,9 +152,16 @@ def update_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You cannot deactivate your own account",
         )
-    for field, value in body.model_dump(exclude_unset=True).items():
+    changes = body.model_dump(exclude_unset=True)
+    if changes.get("is_active") is False:
+        revoke_user_refresh_tokens(db, user.id)
+    if changes.get("is_active") is False or ("role" in changes and changes["role"] != user.role):
+        # Outstanding access tokens would keep the old role (or access) in the other services.
+        record_revocation(db, user.id)
+    for field, value in changes.items():
         setattr(user, field, value)
     db.commit()
+    user_cache.invalidate(user.username)
     db.refresh(user)
     return user
 
@@ -101,7 +178,10 @@ def set_user_password(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     user.hashed_password = hash_password(body.new_password)
+    revoke_user_refresh_tokens(db, user.id)
+    record_revocation(db, user.id)
     db.commit()
+    user_cache.invalidate(user.username)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -119,7 +199,10 @@ def deactivate_user(
             detail="You cannot deactivate your own account",
         )
     user.is_active = False
+    revoke_user_refresh_tokens(db, user.id)
+    record_revocation(db, user.id)
     db.commit()
+    user_cache.invalidate(user.username)
 
 
 @router.delete("/{user_id}/permanent", status_code=status.HTTP_204_NO_CONTENT)
@@ -137,5 +220,8 @@ def delete_user_permanent(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You cannot delete your own account",
         )
+    username = user.username
+    record_revocation(db, user.id)
     db.delete(user)
     db.commit()
+    user_cache.invalidate(username)
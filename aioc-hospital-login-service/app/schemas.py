@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from app.models import UserRole
 
 
@@ -10,11 +10,17 @@ class LoginRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    expires_in: int  # access token lifetime, seconds
+    refresh_token: str
     role: UserRole
     username: str
     full_name: str | None = None
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class UserInfo(BaseModel):
     id: int
     username: str
@@ -72,3 +78,17 @@ class UserResponse(BaseModel):
 class UserListResponse(BaseModel):
     items: list[UserResponse]
     total: int
+
+
+class UserBulkCreate(BaseModel):
+    users: list[UserCreate] = Field(min_length=1)
+
+
+class UserBulkConflict(BaseModel):
+    username: str
+    reason: str  # "exists" (already in the database) or "duplicate" (repeated in this batch)
+
+
+class UserBulkCreateResponse(BaseModel):
+    created: list[UserResponse]
+    conflicts: list[UserBulkConflict]
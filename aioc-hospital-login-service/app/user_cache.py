@@ -0,0 +1,82 @@
+"""Short-TTL cache of active users for get_current_user.
+
+Every authenticated request resolves the token's username to a User; in steady state (the
+frontend polls /api/dashboard/me) that is the same handful of rows over and over. Active users
+are cached per process for USER_CACHE_TTL seconds, keyed by username. The user routes that change
+a user (update, password, deactivate, delete) invalidate its entry right after they commit, so
+deactivation takes effect on the next request rather than after the TTL.
+
+A lookup that started before an invalidation never stores its (possibly stale) row: put() is
+given the version observed before the query and is ignored if any invalidation happened since.
+
+Hits return a fresh, session-less User built from the cached columns, so a request can read it
+freely but never shares ORM state with another request. The cache is per process; the service
+runs a single uvicorn worker.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from app.config import settings
+from app.models import User
+
+_COLUMNS = tuple(c.key for c in User.__table__.columns)
+
+
+class UserCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()  # username -> (expires, columns)
+        self._lock = Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, username: str) -> User | None:
+        if self.ttl <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+        return User(**entry[1])
+
+    def put(self, user: User, version: int) -> None:
+        """Cache an active user loaded while the cache was at `version` (see module docstring)."""
+        if self.ttl <= 0 or not user.is_active:
+            return
+        columns = {key: getattr(user, key) for key in _COLUMNS}
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[user.username] = (time.monotonic() + self.ttl, columns)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.pop(username, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache(ttl=settings.USER_CACHE_TTL, max_entries=settings.USER_CACHE_MAX_ENTRIES)
@@ -0,0 +1,48 @@
+"""refresh tokens
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-05-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # Only the SHA-256 of a refresh token is stored. Every rotation inserts a new row in the
+    # same family and revokes the old one; presenting a revoked token revokes the family.
+    conn.execute(sa.text("""
+        CREATE TABLE IF NOT EXISTS refresh_tokens (
+            id                  SERIAL PRIMARY KEY,
+            user_id             INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            token_hash          VARCHAR(64) NOT NULL,
+            family_id           VARCHAR(32) NOT NULL,
+            expires_at          TIMESTAMP NOT NULL,
+            session_expires_at  TIMESTAMP NOT NULL,
+            created_at          TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            revoked_at          TIMESTAMP
+        )
+    """))
+    conn.execute(sa.text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_token_hash ON refresh_tokens (token_hash)"
+    ))
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_family_id ON refresh_tokens (family_id)"
+    ))
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id ON refresh_tokens (user_id)"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP TABLE IF EXISTS refresh_tokens"))
@@ -0,0 +1,36 @@
+"""token revocations
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-05-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # No FK to users: a revocation must outlive a permanently deleted user until its tokens expire.
+    conn.execute(sa.text("""
+        CREATE TABLE IF NOT EXISTS token_revocations (
+            id          SERIAL PRIMARY KEY,
+            user_id     INTEGER NOT NULL,
+            revoked_at  TIMESTAMP NOT NULL
+        )
+    """))
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_token_revocations_revoked_at ON token_revocations (revoked_at)"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP TABLE IF EXISTS token_revocations"))
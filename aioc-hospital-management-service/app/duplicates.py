@@ -0,0 +1,174 @@
+"""Duplicate-patient detection.
+
+Patients are grouped into blocks by a phonetic key of the last name plus date of birth
+(``patients.blocking_key``, indexed). Only patients sharing a block are compared with the
+fuzzy scorer, so a check costs one index lookup plus a handful of string comparisons
+instead of an ILIKE scan over the whole table.
+"""
+import os
+import unicodedata
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from typing import NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Patient
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+class PatientKey(NamedTuple):
+    """Fields used for scoring; a plain tuple so it can be shipped to worker processes."""
+    id: int
+    first_name: str
+    last_name: str
+    email: str | None
+    phone: str | None
+
+
+def _normalize(value: str | None) -> str:
+    """Lowercase, strip diacritics (Milanković → milankovic) and collapse whitespace."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    ascii_only = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(ascii_only.lower().split())
+
+
+def _normalize_phone(value: str | None) -> str:
+    return "".join(ch for ch in (value or "") if ch.isdigit())
+
+
+def soundex(name: str) -> str:
+    """American Soundex code (e.g. 'Robert' → 'R163'); empty string for names without letters."""
+    letters = [ch for ch in _normalize(name) if "a" <= ch <= "z"]
+    if not letters:
+        return ""
+    first = letters[0]
+    code = first.upper()
+    prev = _SOUNDEX_CODES.get(first, "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != prev:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if ch not in "hw":
+            prev = digit
+    return code.ljust(4, "0")
+
+
+def blocking_key(last_name: str, date_of_birth: date | str) -> str:
+    """Block identifier stored in patients.blocking_key: '<soundex(last_name)>:<YYYY-MM-DD>'."""
+    if isinstance(date_of_birth, date):
+        date_of_birth = date_of_birth.isoformat()
+    return f"{soundex(last_name)}:{(date_of_birth or '').strip()}"
+
+
+def score(a: PatientKey, b: PatientKey) -> float:
+    """Similarity in [0, 1]: fuzzy full-name ratio (either name order), boosted by matching contacts."""
+    name_a = _normalize(f"{a.first_name} {a.last_name}")
+    name_b = _normalize(f"{b.first_name} {b.last_name}")
+    swapped_b = _normalize(f"{b.last_name} {b.first_name}")
+    name_score = max(
+        SequenceMatcher(None, name_a, name_b).ratio(),
+        SequenceMatcher(None, name_a, swapped_b).ratio(),
+    )
+    bonus = 0.0
+    if a.email and _normalize(a.email) == _normalize(b.email):
+        bonus += 0.1
+    if a.phone and _normalize_phone(a.phone) and _normalize_phone(a.phone) == _normalize_phone(b.phone):
+        bonus += 0.1
+    return min(1.0, name_score + bonus)
+
+
+def _key(p: Patient) -> PatientKey:
+    return PatientKey(p.id, p.first_name, p.last_name, p.email, p.phone)
+
+
+def find_candidates(
+    db: Session,
+    first_name: str,
+    last_name: str,
+    date_of_birth: date,
+    email: str | None = None,
+    phone: str | None = None,
+    exclude_id: int | None = None,
+) -> list[tuple[Patient, float]]:
+    """Return active patients in the same block scoring above DUPLICATE_MATCH_THRESHOLD, best first."""
+    q = db.query(Patient).filter(
+        Patient.blocking_key == blocking_key(last_name, date_of_birth),
+        Patient.is_active == True,
+    )
+    if exclude_id is not None:
+        q = q.filter(Patient.id != exclude_id)
+    probe = PatientKey(0, first_name, last_name, email, phone)
+    scored = [(p, score(probe, _key(p))) for p in q.all()]
+    matches = [(p, s) for p, s in scored if s >= settings.DUPLICATE_MATCH_THRESHOLD]
+    matches.sort(key=lambda m: m[1], reverse=True)
+    return matches
+
+
+def _score_blocks(blocks: list[list[PatientKey]], threshold: float) -> list[tuple[int, int, float]]:
+    """Worker: pairwise-score every block in the chunk; returns (lower_id, higher_id, score)."""
+    pairs: list[tuple[int, int, float]] = []
+    for block in blocks:
+        for i, a in enumerate(block):
+            for b in block[i + 1:]:
+                s = score(a, b)
+                if s >= threshold:
+                    pairs.append((min(a.id, b.id), max(a.id, b.id), s))
+    return pairs
+
+
+def scan_duplicates(db: Session) -> tuple[list[tuple[int, int, float]], int]:
+    """Score all multi-member blocks of active patients across a process pool.
+
+    Returns (pairs sorted by score desc, number of blocks scanned).
+    """
+    shared_keys = (
+        select(Patient.blocking_key)
+        .where(Patient.is_active == True, Patient.blocking_key.isnot(None))
+        .group_by(Patient.blocking_key)
+        .having(func.count(Patient.id) > 1)
+    )
+    rows = (
+        db.query(Patient)
+        .filter(Patient.is_active == True, Patient.blocking_key.in_(shared_keys))
+        .order_by(Patient.blocking_key, Patient.id)
+        .all()
+    )
+    blocks: dict[str, list[PatientKey]] = {}
+    for p in rows:
+        blocks.setdefault(p.blocking_key, []).append(_key(p))
+    if not blocks:
+        return [], 0
+
+    workers = settings.DUPLICATE_SCAN_WORKERS or os.cpu_count() or 1
+    block_list = list(blocks.values())
+    chunk_size = max(1, len(block_list) // (workers * 4))
+    chunks = [block_list[i:i + chunk_size] for i in range(0, len(block_list), chunk_size)]
+    threshold = settings.DUPLICATE_MATCH_THRESHOLD
+
+    pairs: list[tuple[int, int, float]] = []
+    if workers == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            pairs.extend(_score_blocks(chunk, threshold))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            for result in pool.map(_score_blocks, chunks, [threshold] * len(chunks)):
+                pairs.extend(result)
+    pairs.sort(key=lambda pair: pair[2], reverse=True)
+    return pairs, len(blocks)
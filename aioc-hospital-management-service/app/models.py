@@ -2,8 +2,8 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, Enum,
-    Integer, String, Text,
+    Boolean, Column, Date, DateTime, Enum, Index,
+    Integer, String, Text, text,
 )
 from app.database import Base
 
@@ -16,12 +16,16 @@ class Gender(str, enum.Enum):
 
 class Patient(Base):
     __tablename__ = "patients"
+    __table_args__ = (
+        # list_patients?is_active=true (ordered by name) only touches active rows
+        Index("ix_patients_active_name", "last_name", "first_name", postgresql_where=text("is_active")),
+    )
 
     id                    = Column(Integer, primary_key=True, index=True)
     medical_record_number = Column(String, unique=True, index=True, nullable=False)
     first_name            = Column(String, nullable=False)
     last_name             = Column(String, nullable=False)
-    date_of_birth         = Column(String, nullable=False)  # stored as ISO date string
+    date_of_birth         = Column(Date, nullable=False, index=True)
     gender                = Column(Enum(Gender, name="gender", create_type=False), nullable=False)
     email                 = Column(String, nullable=True)
     phone                 = Column(String, nullable=True)
@@ -31,3 +35,4 @@ class Patient(Base):
     created_at            = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at            = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     created_by_id         = Column(Integer, nullable=True)  # user id from login service (no FK)
+    blocking_key          = Column(String, nullable=True, index=True)  # soundex(last_name):date_of_birth, see app.duplicates
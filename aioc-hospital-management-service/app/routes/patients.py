@@ -1,18 +1,52 @@
+from datetime import date, timedelta
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.duplicates import blocking_key, find_candidates, scan_duplicates
 from app.models import Patient
-from app.schemas import PatientCreate, PatientUpdate, PatientResponse, PatientListResponse
-from app.auth import get_current_user, CurrentUser
+from app.schemas import (
+    PatientCreate, PatientUpdate, PatientResponse, PatientListResponse,
+    DuplicateCandidate, DuplicatePair, DuplicateScanResponse,
+)
+from app.auth import get_current_user, require_role, CurrentUser
 
 router = APIRouter(prefix="/api/patients", tags=["patients"])
 
 
+def _years_before(day: date, years: int) -> date:
+    """Same calendar day `years` earlier (Feb 29 → Feb 28 in non-leap years)."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def _candidates_for(body: PatientCreate, db: Session) -> list[DuplicateCandidate]:
+    return [
+        DuplicateCandidate(
+            id=p.id,
+            medical_record_number=p.medical_record_number,
+            first_name=p.first_name,
+            last_name=p.last_name,
+            date_of_birth=p.date_of_birth,
+            score=round(s, 3),
+        )
+        for p, s in find_candidates(
+            db, body.first_name, body.last_name, body.date_of_birth, body.email, body.phone,
+        )
+    ]
+
+
 @router.get("", response_model=PatientListResponse)
 def list_patients(
     search: str = Query(default="", description="Search by name or MRN"),
     is_active: bool | None = Query(default=None),
+    born_from: date | None = Query(default=None, description="Date of birth on or after"),
+    born_to: date | None = Query(default=None, description="Date of birth on or before"),
+    min_age: int | None = Query(default=None, ge=0, description="Age in full years, inclusive"),
+    max_age: int | None = Query(default=None, ge=0, description="Age in full years, inclusive"),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=500),
     db: Session = Depends(get_db),
@@ -21,6 +55,17 @@ def list_patients(
     q = db.query(Patient)
     if is_active is not None:
         q = q.filter(Patient.is_active == is_active)
+    # Age filters are translated to a birth-date range so they use ix_patients_date_of_birth.
+    if min_age is not None:
+        latest = _years_before(date.today(), min_age)
+        born_to = min(born_to, latest) if born_to else latest
+    if max_age is not None:
+        earliest = _years_before(date.today(), max_age + 1) + timedelta(days=1)
+        born_from = max(born_from, earliest) if born_from else earliest
+    if born_from is not None:
+        q = q.filter(Patient.date_of_birth >= born_from)
+    if born_to is not None:
+        q = q.filter(Patient.date_of_birth <= born_to)
     if search:
         term = f"%{search}%"
         q = q.filter(
@@ -33,9 +78,31 @@ def list_patients(
     return PatientListResponse(items=items, total=total)
 
 
+@router.post("/duplicates", response_model=list[DuplicateCandidate])
+def find_patient_duplicates(
+    body: PatientCreate,
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    """Likely existing duplicates of a patient about to be registered (same block, fuzzy name match)."""
+    return _candidates_for(body, db)
+
+
+@router.get("/duplicates/scan", response_model=DuplicateScanResponse)
+def scan_patient_duplicates(
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(require_role("admin")),
+):
+    """Admin only: score every block of active patients in parallel workers and list suspected pairs."""
+    pairs, blocks_scanned = scan_duplicates(db)
+    items = [DuplicatePair(patient_id=a, duplicate_id=b, score=round(s, 3)) for a, b, s in pairs]
+    return DuplicateScanResponse(items=items, total=len(items), blocks_scanned=blocks_scanned)
+
+
 @router.post("", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
 def create_patient(
     body: PatientCreate,
+    check_duplicates: bool = Query(default=False, description="Reject with 409 if likely duplicates exist"),
     db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
@@ -44,7 +111,21 @@ def create_patient(
             status_code=status.HTTP_409_CONFLICT,
             detail="A patient with this medical record number already exists",
         )
-    patient = Patient(**body.model_dump(), created_by_id=current_user.id)
+    if check_duplicates:
+        candidates = _candidates_for(body, db)
+        if candidates:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Possible duplicate patients found",
+                    "candidates": [c.model_dump() for c in candidates],
+                },
+            )
+    patient = Patient(
+        **body.model_dump(),
+        created_by_id=current_user.id,
+        blocking_key=blocking_key(body.last_name, body.date_of_birth),
+    )
     db.add(patient)
     db.commit()
     db.refresh(patient)
@@ -75,6 +156,7 @@ def update_patient(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
     for field, value in body.model_dump(exclude_unset=True).items():
         setattr(patient, field, value)
+    patient.blocking_key = blocking_key(patient.last_name, patient.date_of_birth)
     db.commit()
     db.refresh(patient)
     return patient
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, EmailStr
 from app.models import Gender
 
@@ -9,7 +9,7 @@ class PatientCreate(BaseModel):
     medical_record_number: str
     first_name: str
     last_name: str
-    date_of_birth: str
+    date_of_birth: date
     gender: Gender
     email: str | None = None
     phone: str | None = None
@@ -20,7 +20,7 @@ class PatientCreate(BaseModel):
 class PatientUpdate(BaseModel):
     first_name: str | None = None
     last_name: str | None = None
-    date_of_birth: str | None = None
+    date_of_birth: date | None = None
     gender: Gender | None = None
     email: str | None = None
     phone: str | None = None
@@ -34,7 +34,7 @@ class PatientResponse(BaseModel):
     medical_record_number: str
     first_name: str
     last_name: str
-    date_of_birth: str
+    date_of_birth: date
     gender: Gender
     email: str | None
     phone: str | None
@@ -51,3 +51,26 @@ class PatientResponse(BaseModel):
 class PatientListResponse(BaseModel):
     items: list[PatientResponse]
     total: int
+
+
+# ── Duplicate detection schemas ──────────────────────────────────────────────
+
+class DuplicateCandidate(BaseModel):
+    id: int
+    medical_record_number: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    score: float
+
+
+class DuplicatePair(BaseModel):
+    patient_id: int
+    duplicate_id: int
+    score: float
+
+
+class DuplicateScanResponse(BaseModel):
+    items: list[DuplicatePair]
+    total: int
+    blocks_scanned: int
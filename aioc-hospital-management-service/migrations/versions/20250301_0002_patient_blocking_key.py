@@ -0,0 +1,89 @@
+"""add patients.blocking_key for duplicate detection
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-03-01 00:00:00.000000
+
+"""
+import unicodedata
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Frozen copy of app.duplicates.blocking_key as of this revision, so replaying the migration
+# always backfills the same keys whatever the application code does later. 0003 reuses it.
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def _soundex(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    letters = [ch for ch in decomposed.lower() if "a" <= ch <= "z"]
+    if not letters:
+        return ""
+    first = letters[0]
+    code = first.upper()
+    prev = _SOUNDEX_CODES.get(first, "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != prev:
+            code += digit
+            if len(code) == 4:
+                break
+        if ch not in "hw":
+            prev = digit
+    return code.ljust(4, "0")
+
+
+def blocking_key(last_name: str, date_of_birth: date | str) -> str:
+    if isinstance(date_of_birth, date):
+        date_of_birth = date_of_birth.isoformat()
+    return f"{_soundex(last_name)}:{(date_of_birth or '').strip()}"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("ALTER TABLE patients ADD COLUMN IF NOT EXISTS blocking_key VARCHAR"))
+
+    # Backfill in id-ordered batches; the soundex key is computed in Python (blocking_key above).
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, last_name, date_of_birth FROM patients "
+                "WHERE id > :last_id AND blocking_key IS NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE patients SET blocking_key = :key WHERE id = :id"),
+            [{"id": r.id, "key": blocking_key(r.last_name, r.date_of_birth)} for r in rows],
+        )
+        last_id = rows[-1].id
+
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_patients_blocking_key ON patients (blocking_key)"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP INDEX IF EXISTS ix_patients_blocking_key"))
+    conn.execute(sa.text("ALTER TABLE patients DROP COLUMN IF EXISTS blocking_key"))
@@ -0,0 +1,113 @@
+"""convert patients.date_of_birth from VARCHAR to DATE
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-03-15 00:00:00.000000
+
+"""
+import importlib.util
+from datetime import date, datetime
+from pathlib import Path
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _frozen_blocking_key():
+    """blocking_key frozen in 0002 (not app.duplicates, which may change after this revision)."""
+    path = Path(__file__).with_name("20250301_0002_patient_blocking_key.py")
+    spec = importlib.util.spec_from_file_location("_migration_0002_patient_blocking_key", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.blocking_key
+
+
+# ISO is what the frontend sends; the others were seen in manually entered records.
+_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%d.%m.%Y.")
+
+
+def _parse(value: str) -> date | None:
+    value = (value or "").strip()
+    for fmt in _FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    is_varchar = conn.execute(sa.text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'patients' AND column_name = 'date_of_birth'
+          AND data_type = 'character varying'
+    """)).fetchone()
+    if not is_varchar:
+        conn.execute(sa.text(
+            "CREATE INDEX IF NOT EXISTS ix_patients_date_of_birth ON patients (date_of_birth)"
+        ))
+        return
+
+    conn.execute(sa.text("ALTER TABLE patients ADD COLUMN IF NOT EXISTS date_of_birth_d DATE"))
+
+    # Backfill in id-ordered batches so a large table is not parsed in one statement.
+    blocking_key = _frozen_blocking_key()
+    unparseable: list[tuple[int, str]] = []
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, last_name, date_of_birth FROM patients "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for r in rows:
+            dob = _parse(r.date_of_birth)
+            if dob is None:
+                unparseable.append((r.id, r.date_of_birth))
+                continue
+            updates.append({"id": r.id, "dob": dob, "key": blocking_key(r.last_name, dob)})
+        if updates:
+            conn.execute(
+                sa.text("UPDATE patients SET date_of_birth_d = :dob, blocking_key = :key WHERE id = :id"),
+                updates,
+            )
+        last_id = rows[-1].id
+
+    if unparseable:
+        sample = ", ".join(f"id={pid} ({raw!r})" for pid, raw in unparseable[:20])
+        raise RuntimeError(
+            f"{len(unparseable)} patients have an unparseable date_of_birth; fix them and re-run: {sample}"
+        )
+
+    conn.execute(sa.text("ALTER TABLE patients DROP COLUMN date_of_birth"))
+    conn.execute(sa.text("ALTER TABLE patients RENAME COLUMN date_of_birth_d TO date_of_birth"))
+    conn.execute(sa.text("ALTER TABLE patients ALTER COLUMN date_of_birth SET NOT NULL"))
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_patients_date_of_birth ON patients (date_of_birth)"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP INDEX IF EXISTS ix_patients_date_of_birth"))
+    conn.execute(sa.text(
+        "ALTER TABLE patients ALTER COLUMN date_of_birth TYPE VARCHAR "
+        "USING to_char(date_of_birth, 'YYYY-MM-DD')"
+    ))
@@ -0,0 +1,32 @@
+"""partial index on active patients by name
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-03-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # list_patients?is_active=true orders by (last_name, first_name); walking this index
+    # returns the first page without sorting or skipping soft-deleted patients. (Duplicate
+    # lookups by blocking_key are selective; ix_patients_blocking_key from 0002 serves them.)
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_patients_active_name "
+        "ON patients (last_name, first_name) WHERE is_active"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP INDEX IF EXISTS ix_patients_active_name"))
@@ -0,0 +1,164 @@
+"""Batch rendering: many reports in one call, on one template setup.
+
+merged: a single PDF that opens with a table of contents (title, first page, clickable link)
+        and has one outline bookmark per report. The whole batch is laid out in one pass —
+        TOC page numbers are canvas forms referenced from the TOC and filled in as each report
+        starts, so no second layout pass is needed.
+zip:    one PDF per report, rendered back to back with the compiled template, stored in a ZIP.
+
+With deterministic=True the PDFs are rendered in invariant mode and ZIP entries carry a fixed
+timestamp, so the same batch always produces the same bytes.
+"""
+import io
+import re
+import zipfile
+
+from reportlab.lib import colors
+from reportlab.platypus import BaseDocTemplate, Flowable, Frame, PageBreak, PageTemplate, Paragraph, Spacer
+
+from app.pdf_builder import REPORT_TEMPLATE
+from app.schemas import BatchReportItem
+from app.template_engine import format_datetime, make_deterministic, payload_digest
+
+_TOC_LINE_HEIGHT = 16
+_TOC_FONT = "Helvetica"
+_TOC_FONT_SIZE = 10
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def _title(item: BatchReportItem) -> str:
+    if item.title:
+        return item.title
+    return f"{item.patient_name} — {format_datetime(item.report.created_at)}"
+
+
+def _form_name(index: int) -> str:
+    return f"toc-page-{index}"
+
+
+def _key(index: int) -> str:
+    return f"report-{index}"
+
+
+class _DocumentStart(Flowable):
+    """Zero-size marker at the start of each report; handled in _MergedDocTemplate.afterFlowable."""
+
+    def __init__(self, index: int, title: str, subtitle: str):
+        super().__init__()
+        self.index = index
+        self.title = title
+        self.subtitle = subtitle
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+class _TocEntry(Flowable):
+    """One TOC line; the page number is a form XObject defined once the report is laid out."""
+
+    def __init__(self, index: int, title: str):
+        super().__init__()
+        self.index = index
+        self.title = title
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        return availWidth, _TOC_LINE_HEIGHT
+
+    def draw(self):
+        c = self.canv
+        number_width = 40
+        title = self.title
+        max_width = self.width - number_width
+        while title and c.stringWidth(title, _TOC_FONT, _TOC_FONT_SIZE) > max_width:
+            title = title[:-2] + "…"
+        c.setFont(_TOC_FONT, _TOC_FONT_SIZE)
+        c.drawString(0, 4, title)
+        c.linkRect("", _key(self.index), (0, 0, self.width, _TOC_LINE_HEIGHT), relative=1)
+        c.saveState()
+        c.translate(self.width, 4)
+        c.doForm(_form_name(self.index))
+        c.restoreState()
+
+
+class _MergedDocTemplate(BaseDocTemplate):
+    def __init__(self, buf, template, footer_lines: list[str], deterministic: bool):
+        super().__init__(buf, invariant=int(deterministic), **template.doc_kwargs)
+        self.subtitle = ""
+        self.footer_lines = footer_lines
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="normal")
+        # Header/footer are drawn at page end: by then the page's _DocumentStart has set the subtitle.
+        self.addPageTemplates([PageTemplate(id="batch", frames=[frame], onPageEnd=template.on_page)])
+
+    def afterFlowable(self, flowable):
+        if not isinstance(flowable, _DocumentStart):
+            return
+        c = self.canv
+        self.subtitle = flowable.subtitle
+        key = _key(flowable.index)
+        c.bookmarkPage(key)
+        c.addOutlineEntry(flowable.title, key, level=0)
+        c.beginForm(_form_name(flowable.index), lowerx=-60, lowery=-4, upperx=0, uppery=_TOC_LINE_HEIGHT)
+        c.setFont(_TOC_FONT, _TOC_FONT_SIZE)
+        c.setFillColor(colors.black)
+        c.drawRightString(0, 0, str(self.page))
+        c.endForm()
+
+
+def build_merged_pdf(
+    items: list[BatchReportItem],
+    hospital_name: str = "",
+    hospital_address: str = "",
+    hospital_phone: str = "",
+    deterministic: bool = False,
+) -> bytes:
+    template = REPORT_TEMPLATE
+    buf = io.BytesIO()
+    footer_lines = template.footer_lines(hospital_name, hospital_address, hospital_phone)
+    doc = _MergedDocTemplate(buf, template, footer_lines, deterministic)
+    if deterministic:
+        make_deterministic(doc, payload_digest(
+            template.name, template.version, [item.model_dump() for item in items], footer_lines,
+        ))
+
+    story: list = [Paragraph("Contents", template.styles["title"]), Spacer(1, 6)]
+    story.extend(_TocEntry(i, _title(item)) for i, item in enumerate(items))
+    for i, item in enumerate(items):
+        data = item.model_dump()
+        story.append(PageBreak())
+        story.append(_DocumentStart(i, _title(item), template.subtitle(data)))
+        story.extend(template.story(data))
+    doc.build(story)
+    return buf.getvalue()
+
+
+def _filename(index: int, item: BatchReportItem, used: set[str]) -> str:
+    base = item.filename or f"{index + 1:03d}-{item.patient_name}"
+    base = re.sub(r"[^\w.-]+", "-", base.removesuffix(".pdf")).strip("-.") or f"{index + 1:03d}"
+    name, n = f"{base}.pdf", 1
+    while name in used:
+        n += 1
+        name = f"{base}-{n}.pdf"
+    used.add(name)
+    return name
+
+
+def build_zip(
+    items: list[BatchReportItem],
+    hospital_name: str = "",
+    hospital_address: str = "",
+    hospital_phone: str = "",
+    deterministic: bool = False,
+) -> bytes:
+    buf = io.BytesIO()
+    used: set[str] = set()
+    # PDFs are already deflate-compressed internally; storing them avoids wasted CPU.
+    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_STORED) as zf:
+        for i, item in enumerate(items):
+            pdf = REPORT_TEMPLATE.render(item.model_dump(), hospital_name, hospital_address, hospital_phone, deterministic)
+            name = _filename(i, item, used)
+            zf.writestr(zipfile.ZipInfo(name, date_time=_ZIP_EPOCH) if deterministic else name, pdf)
+    return buf.getvalue()
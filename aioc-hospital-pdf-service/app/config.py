@@ -8,5 +8,32 @@ class Settings(BaseSettings):
     HOSPITAL_ADDRESS: str = "Milutina Milankovića 12, 11000 Beograd, Serbia"
     HOSPITAL_PHONE: str = "+381 11 2345-678"
 
+    # Rendering: "process" (worker processes, one per core when RENDER_WORKERS=0) or "thread".
+    RENDER_BACKEND: str = "process"
+    RENDER_WORKERS: int = 0
+    RENDER_MAX_QUEUE: int = 32  # renders waiting for a worker before new requests get 429
+    RENDER_MAX_TASKS_PER_WORKER: int = 500  # recycle a worker process after this many renders (0 = never)
+    RENDER_TIMEOUT: float = 25.0  # below the reports-service client timeout
+    RENDER_RETRY_AFTER: int = 1  # seconds, sent with 429 / 503
+    RENDER_BATCH_MAX_DOCUMENTS: int = 200
+    RENDER_BATCH_TIMEOUT: float = 120.0
+    # Byte-identical output for identical input (fixed dates, content-derived /ID); overridable
+    # per request with ?deterministic=.
+    RENDER_DETERMINISTIC: bool = True
+
+    # Asynchronous render jobs (/api/jobs)
+    RENDER_JOB_CONCURRENCY: int = 2  # jobs rendering at once; the rest of the pool stays free for sync requests
+    RENDER_JOB_MAX_QUEUED: int = 1000
+    RENDER_JOB_MAX_RESULT_BYTES: int = 256 * 1024 * 1024
+    RENDER_JOB_TTL: float = 600.0  # seconds a finished result is kept
+    # Comma-separated hosts a job's ?callback_url= may point at; empty disables callbacks.
+    RENDER_JOB_CALLBACK_HOSTS: str = ""
+
+    INTERNAL_API_KEY: str = ""  # Optional; if set, /api/jobs/* require X-Internal-Key header
+
+    @property
+    def render_job_callback_hosts_list(self) -> list[str]:
+        return [h.strip().lower() for h in self.RENDER_JOB_CALLBACK_HOSTS.split(",") if h.strip()]
+
 
 settings = Settings()
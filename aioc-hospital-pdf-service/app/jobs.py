@@ -0,0 +1,216 @@
+"""Asynchronous render jobs.
+
+A job is accepted immediately (202 + job id) and rendered by RENDER_JOB_CONCURRENCY background
+tasks on the shared render pool; when the pool is saturated a job waits and retries instead of
+failing. At most RENDER_JOB_MAX_QUEUED jobs wait at once (beyond that submit raises JobQueueFull).
+
+Finished results are kept in memory until fetched-and-deleted, RENDER_JOB_TTL seconds after they
+finish, or until RENDER_JOB_MAX_RESULT_BYTES would be exceeded — the oldest results are dropped
+first. If the job was submitted with a callback URL (its host must be in RENDER_JOB_CALLBACK_HOSTS,
+checked by the API), a JSON notification is POSTed there when it finishes (one attempt, redirects
+not followed; polling GET /api/jobs/{id} always works).
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import httpx
+
+from app.config import settings
+from app.render_pool import PoolSaturated, PoolUnavailable, render_pool
+
+logger = logging.getLogger(__name__)
+
+_JOB_LIMIT = 10_000  # finished jobs remembered (results or errors)
+
+
+class JobQueueFull(Exception):
+    """RENDER_JOB_MAX_QUEUED jobs are already waiting."""
+
+
+class Job:
+    def __init__(
+        self,
+        fn: Callable[..., bytes],
+        args: tuple,
+        timeout: float | None,
+        media_type: str,
+        filename: str,
+        callback_url: str | None,
+    ):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"  # queued / rendering / done / failed
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: datetime | None = None
+        self.media_type = media_type
+        self.filename = filename
+        self.callback_url = callback_url
+        self.result: bytes | None = None
+        self.sha256: str | None = None
+        self.error: str | None = None
+        self._call: tuple[Callable[..., bytes], tuple, float | None] | None = (fn, args, timeout)
+        self._finished_monotonic = 0.0
+
+    @property
+    def size_bytes(self) -> int | None:
+        return len(self.result) if self.result is not None else None
+
+
+class RenderJobs:
+    def __init__(self, concurrency: int, max_queued: int, max_result_bytes: int, ttl: float):
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.max_result_bytes = max_result_bytes
+        self.ttl = ttl
+        self._jobs: OrderedDict[str, Job] = OrderedDict()  # submission order
+        self._queue: asyncio.Queue[Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._client: httpx.AsyncClient | None = None
+        self._result_bytes = 0
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._client = httpx.AsyncClient(timeout=5.0)
+        self._tasks = [asyncio.create_task(self._worker(), name=f"pdf-job-{i}") for i in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def submit(
+        self,
+        fn: Callable[..., bytes],
+        *args: Any,
+        timeout: float | None = None,
+        media_type: str = "application/pdf",
+        filename: str = "document.pdf",
+        callback_url: str | None = None,
+    ) -> Job:
+        if self._queue is None:
+            raise JobQueueFull("job queue not started")
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFull()
+        self._purge()
+        job = Job(fn, args, timeout, media_type, filename, callback_url)
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def delete(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.status in ("queued", "rendering"):
+            return False
+        self._forget(job)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "jobs_queued": self._queue.qsize() if self._queue else 0,
+            "jobs_stored": len(self._jobs),
+            "job_result_bytes": self._result_bytes,
+        }
+
+    def _forget(self, job: Job) -> None:
+        self._jobs.pop(job.id, None)
+        if job.result is not None:
+            self._result_bytes -= len(job.result)
+            job.result = None
+
+    def _purge(self) -> None:
+        """Drop expired finished jobs, then the oldest finished ones while over the job / byte limits."""
+        now = time.monotonic()
+        finished = [j for j in self._jobs.values() if j.status in ("done", "failed")]
+        for job in finished:
+            if now - job._finished_monotonic > self.ttl:
+                self._forget(job)
+        for job in finished:
+            if len(self._jobs) <= _JOB_LIMIT and self._result_bytes <= self.max_result_bytes:
+                break
+            if job.id in self._jobs:
+                self._forget(job)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        fn, args, timeout = job._call
+        job._call = None
+        job.status = "rendering"
+        try:
+            result = await self._render(fn, args, timeout)
+        except PoolUnavailable as e:
+            self._finish(job, error=str(e))
+        except Exception as e:
+            logger.exception("PDF job %s failed", job.id)
+            self._finish(job, error=f"render failed: {e.__class__.__name__}")
+        else:
+            if len(result) > self.max_result_bytes:
+                self._finish(job, error="result too large to store")
+            else:
+                self._finish(job, result=result)
+        await self._notify(job)
+
+    @staticmethod
+    async def _render(fn: Callable[..., bytes], args: tuple, timeout: float | None) -> bytes:
+        while True:
+            try:
+                return await render_pool.run(fn, *args, timeout=timeout)
+            except PoolSaturated:
+                await asyncio.sleep(settings.RENDER_RETRY_AFTER)
+
+    def _finish(self, job: Job, result: bytes | None = None, error: str | None = None) -> None:
+        job.finished_at = datetime.now(timezone.utc)
+        job._finished_monotonic = time.monotonic()
+        if error is not None:
+            job.status, job.error = "failed", error
+            logger.warning("PDF job %s failed: %s", job.id, error)
+        else:
+            job.status = "done"
+            job.result = result
+            job.sha256 = hashlib.sha256(result).hexdigest()
+            self._result_bytes += len(result)
+        self._purge()
+
+    async def _notify(self, job: Job) -> None:
+        if not job.callback_url or self._client is None:
+            return
+        try:
+            r = await self._client.post(job.callback_url, json={
+                "job_id": job.id,
+                "status": job.status,
+                "sha256": job.sha256,
+                "size_bytes": job.size_bytes,
+                "error": job.error,
+                "result_path": f"/api/jobs/{job.id}/result",
+            })
+            r.raise_for_status()
+        except httpx.HTTPError:
+            logger.warning("Callback for PDF job %s to %s failed", job.id, job.callback_url, exc_info=True)
+
+
+render_jobs = RenderJobs(
+    concurrency=settings.RENDER_JOB_CONCURRENCY,
+    max_queued=settings.RENDER_JOB_MAX_QUEUED,
+    max_result_bytes=settings.RENDER_JOB_MAX_RESULT_BYTES,
+    ttl=settings.RENDER_JOB_TTL,
+)
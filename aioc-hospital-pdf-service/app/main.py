@@ -1,40 +1,335 @@
 # AIOC Hospital PDF Service
+import hashlib
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Any, Callable, NamedTuple
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, status
 from fastapi.responses import Response
+from pydantic import HttpUrl
 
 from app.config import settings
-from app.schemas import GenerateReportRequest
-from app.pdf_builder import build_report_pdf
+from app.schemas import (
+    GenerateBatchRequest,
+    GenerateDocumentRequest,
+    GenerateReportRequest,
+    JobStatusResponse,
+    TemplateInfo,
+)
+from app.pdf_builder import build_document_pdf, build_report_pdf
+from app.batch import build_merged_pdf, build_zip
+from app.jobs import Job, JobQueueFull, render_jobs
+from app.template_engine import TemplateError, templates
+from app.render_pool import PoolSaturated, PoolUnavailable, render_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Starting AIOC Hospital PDF Service…")
+    render_pool.start()
+    render_jobs.start()
+    yield
+    await render_jobs.stop()
+    render_pool.stop()
+
+
 app = FastAPI(
     title="AIOC Hospital PDF Service",
     description="Generates PDFs for reports and other documents",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
+class _RenderCall(NamedTuple):
+    """A validated render request: what to run on the pool and how to serve the result."""
+
+    fn: Callable[..., bytes]
+    args: tuple
+    media_type: str
+    filename: str
+    timeout: float | None = None
+    headers: dict[str, str] = {}
+
+
+def _retry_after() -> dict[str, str]:
+    return {"Retry-After": str(settings.RENDER_RETRY_AFTER)}
+
+
+async def _render(call: _RenderCall) -> Any:
+    """Run a render on the pool, mapping backpressure to 429 / 503 with Retry-After."""
+    try:
+        return await render_pool.run(call.fn, *call.args, timeout=call.timeout)
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="PDF renderer is busy, retry shortly",
+            headers=_retry_after(),
+        )
+    except PoolUnavailable as e:
+        logger.warning("PDF render failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF renderer unavailable",
+            headers=_retry_after(),
+        )
+
+
+def _document_response(content: bytes, media_type: str, filename: str, headers: dict | None = None) -> Response:
+    """Response carrying the SHA-256 of the body, so callers can dedupe identical documents."""
+    digest = hashlib.sha256(content).hexdigest()
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Content-SHA256": digest,
+            "ETag": f'"{digest}"',
+            **(headers or {}),
+        },
+    )
+
+
+async def _render_response(call: _RenderCall) -> Response:
+    return _document_response(await _render(call), call.media_type, call.filename, call.headers)
+
+
+def _deterministic(value: bool | None) -> bool:
+    return settings.RENDER_DETERMINISTIC if value is None else value
+
+
+def _hospital() -> tuple[str, str, str]:
+    return settings.HOSPITAL_NAME, settings.HOSPITAL_ADDRESS, settings.HOSPITAL_PHONE
+
+
+def _report_call(body: GenerateReportRequest, deterministic: bool | None) -> _RenderCall:
+    return _RenderCall(
+        build_report_pdf,
+        (body, *_hospital(), _deterministic(deterministic)),
+        "application/pdf",
+        "report.pdf",
+    )
+
+
+def _batch_call(body: GenerateBatchRequest, deterministic: bool | None) -> _RenderCall:
+    if len(body.documents) > settings.RENDER_BATCH_MAX_DOCUMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.RENDER_BATCH_MAX_DOCUMENTS} documents per batch",
+        )
+    merged = body.format == "merged"
+    return _RenderCall(
+        build_merged_pdf if merged else build_zip,
+        (body.documents, *_hospital(), _deterministic(deterministic)),
+        "application/pdf" if merged else "application/zip",
+        "reports.pdf" if merged else "reports.zip",
+        timeout=settings.RENDER_BATCH_TIMEOUT,
+    )
+
+
+def _document_call(template_name: str, body: GenerateDocumentRequest, deterministic: bool | None) -> _RenderCall:
+    try:
+        template = templates.get(template_name, body.version)
+    except TemplateError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    missing = template.missing_fields(body.data)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Missing required fields: {', '.join(missing)}",
+        )
+    return _RenderCall(
+        build_document_pdf,
+        (template.name, template.version, body.data, *_hospital(), _deterministic(deterministic)),
+        "application/pdf",
+        f"{template.name}.pdf",
+        headers={"X-Template-Version": str(template.version)},
+    )
+
+
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "render_backend": render_pool.backend,
+        "render_workers": render_pool.workers,
+        "renders_in_flight": render_pool.in_flight,
+        "render_capacity": render_pool.capacity,
+        **render_jobs.stats(),
+    }
 
 
 @app.post("/api/generate/report")
-def generate_report_pdf(body: GenerateReportRequest):
+async def generate_report_pdf(body: GenerateReportRequest, deterministic: bool | None = Query(None)):
     """Generate a PDF for a patient report. Called by reports-service."""
-    pdf_bytes = build_report_pdf(
-        body,
-        hospital_name=settings.HOSPITAL_NAME,
-        hospital_address=settings.HOSPITAL_ADDRESS,
-        hospital_phone=settings.HOSPITAL_PHONE,
+    return await _render_response(_report_call(body, deterministic))
+
+
+@app.post("/api/generate/reports/batch")
+async def generate_reports_batch(body: GenerateBatchRequest, deterministic: bool | None = Query(None)):
+    """Render many reports in one call: a merged PDF with a table of contents, or a ZIP of PDFs."""
+    return await _render_response(_batch_call(body, deterministic))
+
+
+@app.get("/api/templates", response_model=list[TemplateInfo])
+def list_templates():
+    """Document templates available to /api/generate/documents/{template_name}."""
+    return [
+        TemplateInfo(name=t.name, version=t.version, required=[".".join(p) for p in t.required])
+        for t in templates
+    ]
+
+
+@app.post("/api/generate/documents/{template_name}")
+async def generate_document_pdf(
+    template_name: str,
+    body: GenerateDocumentRequest,
+    deterministic: bool | None = Query(None),
+):
+    """Render any templated document (appointment slip, referral letter, discharge summary, …)."""
+    return await _render_response(_document_call(template_name, body, deterministic))
+
+
+# --- asynchronous jobs ---
+# Jobs keep results and POST callbacks on the submitter's behalf, so unlike the generate routes
+# they require the internal key (when INTERNAL_API_KEY is set) and only call back allowed hosts.
+
+
+def _require_internal_key(x_internal_key: str | None = Header(default=None, alias="X-Internal-Key")):
+    key = (settings.INTERNAL_API_KEY or "").strip()
+    if key and x_internal_key != key:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing internal key")
+    return True
+
+
+def _callback_target(callback_url: HttpUrl | None) -> str | None:
+    if callback_url is None:
+        return None
+    if (callback_url.host or "").lower() not in settings.render_job_callback_hosts_list:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"callback_url host {callback_url.host!r} is not allowed",
+        )
+    return str(callback_url)
+
+
+def _job_status(job: Job) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        media_type=job.media_type,
+        size_bytes=job.size_bytes,
+        sha256=job.sha256,
+        error=job.error,
+        result_url=f"/api/jobs/{job.id}/result",
     )
+
+
+async def _submit(call: _RenderCall, callback_url: HttpUrl | None) -> Response:
+    try:
+        job = render_jobs.submit(
+            call.fn,
+            *call.args,
+            timeout=call.timeout,
+            media_type=call.media_type,
+            filename=call.filename,
+            callback_url=_callback_target(callback_url),
+        )
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many queued PDF jobs, retry shortly",
+            headers=_retry_after(),
+        )
     return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": "attachment; filename=report.pdf",
-        },
+        content=_job_status(job).model_dump_json(),
+        status_code=status.HTTP_202_ACCEPTED,
+        media_type="application/json",
+        headers={"Location": f"/api/jobs/{job.id}"},
     )
+
+
+def _get_job(job_id: str) -> Job:
+    job = render_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found or expired")
+    return job
+
+
+@app.post(
+    "/api/jobs/report",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=JobStatusResponse,
+    dependencies=[Depends(_require_internal_key)],
+)
+async def submit_report_job(
+    body: GenerateReportRequest,
+    deterministic: bool | None = Query(None),
+    callback_url: HttpUrl | None = Query(None),
+):
+    """Queue a report render; poll GET /api/jobs/{job_id} or wait for the callback."""
+    return await _submit(_report_call(body, deterministic), callback_url)
+
+
+@app.post(
+    "/api/jobs/reports/batch",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=JobStatusResponse,
+    dependencies=[Depends(_require_internal_key)],
+)
+async def submit_batch_job(
+    body: GenerateBatchRequest,
+    deterministic: bool | None = Query(None),
+    callback_url: HttpUrl | None = Query(None),
+):
+    return await _submit(_batch_call(body, deterministic), callback_url)
+
+
+@app.post(
+    "/api/jobs/documents/{template_name}",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=JobStatusResponse,
+    dependencies=[Depends(_require_internal_key)],
+)
+async def submit_document_job(
+    template_name: str,
+    body: GenerateDocumentRequest,
+    deterministic: bool | None = Query(None),
+    callback_url: HttpUrl | None = Query(None),
+):
+    return await _submit(_document_call(template_name, body, deterministic), callback_url)
+
+
+# Job endpoints are async so they run on the event loop, like the job workers that mutate the store.
+@app.get("/api/jobs/{job_id}", response_model=JobStatusResponse, dependencies=[Depends(_require_internal_key)])
+async def get_job(job_id: str):
+    return _job_status(_get_job(job_id))
+
+
+@app.get("/api/jobs/{job_id}/result", dependencies=[Depends(_require_internal_key)])
+async def get_job_result(job_id: str):
+    """The rendered document once the job is done (409 while queued/rendering or if it failed)."""
+    job = _get_job(job_id)
+    if job.status != "done" or job.result is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status}" + (f": {job.error}" if job.error else ""),
+        )
+    return _document_response(job.result, job.media_type, job.filename)
+
+
+@app.delete(
+    "/api/jobs/{job_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(_require_internal_key)],
+)
+async def delete_job(job_id: str):
+    """Drop a finished job and its result before it expires."""
+    job = _get_job(job_id)
+    if not render_jobs.delete(job.id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
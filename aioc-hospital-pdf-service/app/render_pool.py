@@ -0,0 +1,138 @@
+"""Rendering backend with admission control.
+
+ReportLab is pure Python and holds the GIL, so with RENDER_BACKEND=process renders run in a
+pool of worker processes (one per core by default) that are pre-warmed at startup — the
+compiled templates, fonts and styles are loaded before the first request — and recycled after
+RENDER_MAX_TASKS_PER_WORKER renders to cap memory growth. RENDER_BACKEND=thread keeps rendering
+in-process on a thread pool (useful for local development and tests).
+
+At most workers + RENDER_MAX_QUEUE renders are admitted at once; beyond that callers get
+PoolSaturated immediately (the API maps it to 429 + Retry-After) instead of piling up requests.
+A render holds its slot until the worker is actually done with it — a caller that times out
+stops waiting, but the render it abandoned still counts until it finishes.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturated(Exception):
+    """All workers busy and the wait queue is full."""
+
+
+class PoolUnavailable(Exception):
+    """The pool is not running, a worker died, or the render timed out."""
+
+
+def _warm_worker() -> None:
+    """Worker initializer: import the engine (compiles all templates) and render each sample once."""
+    from app.template_engine import templates
+
+    for template in templates:
+        template.render(template.sample)
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class RenderPool:
+    def __init__(self, backend: str, workers: int, max_queue: int, max_tasks_per_worker: int, timeout: float):
+        self.backend = backend
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.timeout = timeout
+        self._executor: Executor | None = None
+        self._lock = Lock()
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _create_executor(self) -> Executor:
+        if self.backend == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf-render")
+        # spawn: fork would copy the server's event loop and threads into the workers;
+        # it is also required for max_tasks_per_child.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+            max_tasks_per_child=self.max_tasks_per_worker or None,
+        )
+
+    def start(self) -> None:
+        self._executor = self._create_executor()
+        if self.backend != "thread":
+            # Submitting one task per worker makes the executor spawn (and warm) all of them now.
+            pids = {f.result() for f in [self._executor.submit(_noop) for _ in range(self.workers)]}
+            logger.info("PDF render pool started: %d worker processes (%s)", len(pids), sorted(pids))
+        else:
+            _warm_worker()
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _restart(self, broken: Executor) -> None:
+        """Replace `broken` — once: every render in flight on it sees the same BrokenProcessPool."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            logger.warning("PDF render pool broken; restarting workers")
+            self._executor = self._create_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: float | None = None) -> Any:
+        """Run fn(*args) on the pool. Raises PoolSaturated / PoolUnavailable."""
+        executor = self._executor
+        if executor is None:
+            raise PoolUnavailable("render pool not started")
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise PoolSaturated()
+            self._in_flight += 1
+        try:
+            future = executor.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError) as e:  # RuntimeError: replaced (shut down) meanwhile
+            self._release(None)
+            self._restart(executor)
+            raise PoolUnavailable("render worker crashed") from e
+        # The slot is freed when the render really ends, not when this caller stops waiting.
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout or self.timeout)
+        except BrokenProcessPool as e:
+            self._restart(executor)
+            raise PoolUnavailable("render worker crashed") from e
+        except asyncio.TimeoutError as e:
+            raise PoolUnavailable("render timed out") from e
+
+
+render_pool = RenderPool(
+    backend=settings.RENDER_BACKEND,
+    workers=settings.RENDER_WORKERS,
+    max_queue=settings.RENDER_MAX_QUEUE,
+    max_tasks_per_worker=settings.RENDER_MAX_TASKS_PER_WORKER,
+    timeout=settings.RENDER_TIMEOUT,
+)
@@ -1,5 +1,7 @@
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
 
 
 class ReportPayload(BaseModel):
@@ -15,3 +17,36 @@ class ReportPayload(BaseModel):
 class GenerateReportRequest(BaseModel):
     patient_name: str
     report: ReportPayload
+
+
+class BatchReportItem(GenerateReportRequest):
+    title: str | None = None  # TOC / bookmark label (merged)
+    filename: str | None = None  # entry name (zip)
+
+
+class GenerateBatchRequest(BaseModel):
+    format: Literal["merged", "zip"] = "merged"
+    documents: list[BatchReportItem] = Field(min_length=1)
+
+
+class GenerateDocumentRequest(BaseModel):
+    data: dict[str, Any]
+    version: int | None = None  # template version; latest when omitted
+
+
+class TemplateInfo(BaseModel):
+    name: str
+    version: int
+    required: list[str]
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str  # queued / rendering / done / failed
+    created_at: datetime
+    finished_at: datetime | None = None
+    media_type: str
+    size_bytes: int | None = None
+    sha256: str | None = None
+    error: str | None = None
+    result_url: str
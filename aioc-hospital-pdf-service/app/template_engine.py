@@ -0,0 +1,380 @@
+"""Declarative document templates.
+
+Each document type is a JSON definition in app/templates/ (merged over _base.json): page
+geometry, header, paragraph styles, the fields a request must provide, and a list of blocks:
+
+    {"type": "title", "text": "..."}                      document title
+    {"type": "heading", "text": "..."}                    section heading
+    {"type": "paragraph", "text": "...", "style": "body"} free text
+    {"type": "section", "heading": "...", "field": "a.b", "default": "—", "optional": false}
+                                                          heading + field value; optional sections
+                                                          are left out when the value is empty
+    {"type": "fields", "rows": [["Label", "..."], ...]}   two-column label / value table
+    {"type": "spacer", "height": 12}
+
+Texts may reference request data as {dotted.path} or {dotted.path|filter} (filters: date,
+datetime). Definitions are parsed and compiled once — styles built, texts split into literal and
+lookup parts — and cached by (name, version); a render only walks the compiled blocks.
+
+Deterministic renders use ReportLab's invariant mode (fixed creation/modification dates) and seed
+the document /ID with a digest of the template, the data and the footer instead of the current
+time, so the same input always produces byte-identical output and different input a different /ID.
+"""
+import hashlib
+import json
+import re
+from datetime import date, datetime
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import A4, LETTER
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+_PAGE_SIZES = {"A4": A4, "LETTER": LETTER}
+_ALIGNMENTS = {"left": TA_LEFT, "center": TA_CENTER, "right": TA_RIGHT, "justify": TA_JUSTIFY}
+_BRAND_COLOR = colors.HexColor("#1a4a7a")
+_PLACEHOLDER = re.compile(r"\{([\w.]+)(?:\|(\w+))?\}")
+_MISSING = "—"
+
+
+class TemplateError(Exception):
+    """A template definition is invalid, or a template does not exist."""
+
+
+def _as_datetime(value: Any) -> datetime | date | None:
+    if isinstance(value, (datetime, date)):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def format_datetime(value: Any) -> str:
+    dt = _as_datetime(value)
+    if dt is None:
+        return _MISSING if value in (None, "") else str(value)
+    if not isinstance(dt, datetime):
+        return dt.strftime("%d/%m/%Y")
+    return dt.strftime("%d/%m/%Y %H:%M")
+
+
+def format_date(value: Any) -> str:
+    dt = _as_datetime(value)
+    if dt is None:
+        return _MISSING if value in (None, "") else str(value)
+    return dt.strftime("%d/%m/%Y")
+
+
+_FILTERS: dict[str, Callable[[Any], str]] = {"date": format_date, "datetime": format_datetime}
+
+
+def escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace("\n", "<br/>")
+
+
+def lookup(data: dict, path: tuple[str, ...]) -> Any:
+    value: Any = data
+    for part in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class _Text:
+    """A text with {placeholders}, split once into literal and lookup parts."""
+
+    def __init__(self, source: str):
+        self.parts: list[str | tuple[tuple[str, ...], Callable[[Any], str] | None]] = []
+        pos = 0
+        for m in _PLACEHOLDER.finditer(source):
+            if m.start() > pos:
+                self.parts.append(source[pos:m.start()])
+            name = m.group(2)
+            if name is not None and name not in _FILTERS:
+                raise TemplateError(f"Unknown filter {name!r} in {source!r}")
+            self.parts.append((tuple(m.group(1).split(".")), _FILTERS.get(name) if name else None))
+            pos = m.end()
+        if pos < len(source):
+            self.parts.append(source[pos:])
+        self.static = all(isinstance(p, str) for p in self.parts)
+
+    def render(self, data: dict, markup: bool = True) -> str:
+        """The text with data filled in; escaped for Paragraph markup unless markup=False."""
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            path, fmt = part
+            value = lookup(data, path)
+            if fmt is not None:
+                out.append(fmt(value))
+            else:
+                out.append(_MISSING if value in (None, "") else str(value))
+        text = "".join(out)
+        return escape(text) if markup else text
+
+
+def payload_digest(*parts: Any) -> bytes:
+    """Stable digest of JSON-able render inputs (datetimes as ISO strings)."""
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).digest()
+
+
+def make_deterministic(doc, digest: bytes) -> None:
+    """Seed the /ID of an invariant-mode document with digest once its canvas exists."""
+
+    def seed():
+        doc.canv._doc.updateSignature(digest)
+
+    doc.beforeDocument = seed
+
+
+Block = Callable[[dict], list[Flowable]]
+
+
+class CompiledTemplate:
+    def __init__(self, definition: dict):
+        try:
+            self.name: str = definition["name"]
+            self.version: int = int(definition["version"])
+        except (KeyError, ValueError) as e:
+            raise TemplateError(f"Template definition needs a name and an integer version: {e}") from e
+        self.required = [tuple(p.split(".")) for p in definition.get("required", [])]
+        self.sample: dict = definition.get("sample", {})
+
+        base = getSampleStyleSheet()
+        self.styles: dict[str, ParagraphStyle] = {}
+        for key, spec in definition.get("styles", {}).items():
+            spec = dict(spec)
+            parent = base[spec.pop("parent", "Normal")]
+            if "alignment" in spec:
+                spec["alignment"] = _ALIGNMENTS[spec["alignment"]]
+            self.styles[key] = ParagraphStyle(name=f"{self.name}.{key}", parent=parent, **spec)
+        for key in ("title", "heading", "body", "label"):
+            if key not in self.styles:
+                raise TemplateError(f"Template {self.name} has no {key!r} style")
+
+        page = definition.get("page", {})
+        self.page_width, self.page_height = _PAGE_SIZES[page.get("size", "A4")]
+        self.doc_kwargs = dict(
+            pagesize=(self.page_width, self.page_height),
+            leftMargin=page.get("margin_left_mm", 20) * mm,
+            rightMargin=page.get("margin_right_mm", 20) * mm,
+            topMargin=page.get("margin_top_mm", 32) * mm,
+            bottomMargin=page.get("margin_bottom_mm", 28) * mm,
+            title=definition.get("title", self.name.replace("_", " ").title()),
+        )
+        header = definition.get("header", {})
+        self.brand: str = header.get("brand", "AIOC Hospital")
+        self._subtitle = _Text(header["subtitle"]) if header.get("subtitle") else None
+        self._line_style = ParagraphStyle(name=f"{self.name}.body_line", parent=self.styles["body"], spaceAfter=0)
+        self._table_style = TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+            ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ])
+
+        self.blocks: list[Block] = [self._compile_block(b) for b in definition.get("blocks", [])]
+        # Load font metrics now rather than on the first render.
+        for style in self.styles.values():
+            pdfmetrics.getFont(style.fontName)
+        for font in ("Helvetica", "Helvetica-Bold"):
+            pdfmetrics.getFont(font)
+
+    # --- compilation ---
+
+    def _compile_block(self, block: dict) -> Block:
+        kind = block.get("type")
+        if kind in ("title", "heading", "paragraph"):
+            style_name = block.get("style", {"title": "title", "heading": "heading"}.get(kind, "body"))
+            style = self.styles[style_name]
+            text = _Text(block["text"])
+            if text.static:
+                rendered = text.render({})
+                return lambda data: [Paragraph(rendered, style)]
+            return lambda data: [Paragraph(text.render(data), style)]
+        if kind == "spacer":
+            height = float(block.get("height", 6))
+            return lambda data: [Spacer(1, height)]
+        if kind == "section":
+            return partial(
+                self._section,
+                escape(block["heading"]),
+                tuple(block["field"].split(".")),
+                escape(block.get("default", _MISSING)),
+                bool(block.get("optional", False)),
+            )
+        if kind == "fields":
+            rows = [(escape(label), _Text(value)) for label, value in block["rows"]]
+            return partial(self._fields, rows)
+        raise TemplateError(f"Template {self.name}: unknown block type {kind!r}")
+
+    def _section(self, heading: str, path: tuple[str, ...], default: str, optional: bool, data: dict) -> list[Flowable]:
+        value = lookup(data, path)
+        if value in (None, "") and optional:
+            return []
+        if value in (None, ""):
+            return [Paragraph(heading, self.styles["heading"]), Paragraph(default, self.styles["body"])]
+        return [Paragraph(heading, self.styles["heading"]), *self._lines(str(value))]
+
+    def _lines(self, text: str) -> list[Flowable]:
+        """One Paragraph per line instead of a single Paragraph with <br/>s.
+
+        ReportLab re-wraps the remainder of a paragraph each time it splits it across a page, so
+        one long multi-line paragraph costs O(pages²); separate lines keep rendering linear and
+        lay out identically (same leading, body spacing after the last line).
+        """
+        lines = text.split("\n")
+        if len(lines) == 1:
+            return [Paragraph(escape(text), self.styles["body"])]
+        line_style, body_style = self._line_style, self.styles["body"]
+        flowables: list[Flowable] = []
+        for line in lines[:-1]:
+            flowables.append(Paragraph(escape(line), line_style) if line.strip() else Spacer(1, line_style.leading))
+        flowables.append(Paragraph(escape(lines[-1]), body_style))
+        return flowables
+
+    def _fields(self, rows: list[tuple[str, _Text]], data: dict) -> list[Flowable]:
+        label_style, body_style = self.styles["label"], self.styles["body"]
+        width = self.page_width - self.doc_kwargs["leftMargin"] - self.doc_kwargs["rightMargin"]
+        table = Table(
+            [[Paragraph(label, label_style), Paragraph(value.render(data), body_style)] for label, value in rows],
+            colWidths=[width * 0.32, width * 0.68],
+        )
+        table.setStyle(self._table_style)
+        return [table, Spacer(1, 6)]
+
+    # --- rendering ---
+
+    def missing_fields(self, data: dict) -> list[str]:
+        return [".".join(p) for p in self.required if lookup(data, p) in (None, "")]
+
+    def subtitle(self, data: dict) -> str:
+        return self._subtitle.render(data, markup=False) if self._subtitle else ""
+
+    def story(self, data: dict) -> list[Flowable]:
+        story: list[Flowable] = []
+        for block in self.blocks:
+            story.extend(block(data))
+        return story
+
+    def _draw_header(self, c: canvas.Canvas, doc) -> None:
+        center = self.page_width / 2
+        c.saveState()
+        c.setFont("Helvetica-Bold", 18)
+        c.setFillColor(_BRAND_COLOR)
+        c.drawCentredString(center, self.page_height - 18 * mm, self.brand)
+        c.setFont("Helvetica", 9)
+        c.setFillColor(colors.black)
+        if doc.subtitle:
+            c.drawCentredString(center, self.page_height - 24 * mm, doc.subtitle)
+        c.line(20 * mm, self.page_height - 28 * mm, self.page_width - 20 * mm, self.page_height - 28 * mm)
+        c.restoreState()
+
+    def _draw_footer(self, c: canvas.Canvas, doc) -> None:
+        center = self.page_width / 2
+        c.saveState()
+        c.setFont("Helvetica", 8)
+        c.setFillColor(colors.grey)
+        y = 16 * mm
+        for line in doc.footer_lines:
+            c.drawCentredString(center, y, line)
+            y -= 3 * mm
+        c.restoreState()
+
+    def on_page(self, canv: canvas.Canvas, doc) -> None:
+        self._draw_header(canv, doc)
+        self._draw_footer(canv, doc)
+
+    @staticmethod
+    def footer_lines(hospital_name: str, hospital_address: str, hospital_phone: str) -> list[str]:
+        return [line for line in (hospital_name or "AIOC Hospital", hospital_address, hospital_phone) if line]
+
+    def render(
+        self,
+        data: dict,
+        hospital_name: str = "",
+        hospital_address: str = "",
+        hospital_phone: str = "",
+        deterministic: bool = False,
+    ) -> bytes:
+        buf = BytesIO()
+        doc = SimpleDocTemplate(buf, invariant=int(deterministic), **self.doc_kwargs)
+        doc.subtitle = self.subtitle(data)
+        doc.footer_lines = self.footer_lines(hospital_name, hospital_address, hospital_phone)
+        if deterministic:
+            make_deterministic(doc, payload_digest(self.name, self.version, data, doc.footer_lines))
+        doc.build(self.story(data), onFirstPage=self.on_page, onLaterPages=self.on_page)
+        return buf.getvalue()
+
+
+def _merge(base: dict, override: dict) -> dict:
+    out = dict(base)
+    for key, value in override.items():
+        out[key] = _merge(out[key], value) if isinstance(value, dict) and isinstance(out.get(key), dict) else value
+    return out
+
+
+def load_definitions(directory: Path = TEMPLATE_DIR) -> list[dict]:
+    base = json.loads((directory / "_base.json").read_text(encoding="utf-8"))
+    definitions = []
+    for path in sorted(directory.glob("*.json")):
+        if path.name.startswith("_"):
+            continue
+        definitions.append(_merge(base, json.loads(path.read_text(encoding="utf-8"))))
+    return definitions
+
+
+class TemplateRegistry:
+    """Compiled templates keyed by (name, version); the highest version is the default."""
+
+    def __init__(self):
+        self._compiled: dict[tuple[str, int], CompiledTemplate] = {}
+        self._latest: dict[str, int] = {}
+
+    def load(self, directory: Path = TEMPLATE_DIR) -> None:
+        for definition in load_definitions(directory):
+            self.register(definition)
+
+    def register(self, definition: dict) -> CompiledTemplate:
+        key = (definition.get("name"), int(definition.get("version", 0)))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = CompiledTemplate(definition)
+            self._compiled[key] = compiled
+            self._latest[compiled.name] = max(self._latest.get(compiled.name, 0), compiled.version)
+        return compiled
+
+    def get(self, name: str, version: int | None = None) -> CompiledTemplate:
+        if version is None:
+            version = self._latest.get(name)
+        compiled = self._compiled.get((name, version))
+        if compiled is None:
+            raise TemplateError(f"Unknown template {name!r}" + (f" version {version}" if version else ""))
+        return compiled
+
+    def names(self) -> list[str]:
+        return sorted(self._latest)
+
+    def __iter__(self):
+        return (self._compiled[(name, self._latest[name])] for name in self.names())
+
+
+templates = TemplateRegistry()
+templates.load()
@@ -0,0 +1,172 @@
+"""Benchmark: how report rendering scales from 1 to 100 pages, with a baseline regression gate.
+
+Builds synthetic reports whose multi-line `content` and `lab_exams` fields fill roughly 1, 5, 10,
+25, 50 and 100 pages, renders each deterministically with the compiled medical_report template and records per size:
+
+    latency   median and p95 wall time of a full render (ms)
+    memory    peak Python heap allocated during one render (KiB, tracemalloc)
+    size      output bytes and actual page count
+
+Results are compared against benchmarks/baselines/render_scaling.json and the process exits with
+status 1 when a gated metric regresses by more than its tolerance. Latency depends on the machine:
+re-record the baseline (--update-baseline) on the hardware that runs the gate, or gate only on
+the machine-independent metrics (--gate memory,size).
+
+    cd aioc-hospital-pdf-service && python -m benchmarks.render_scaling [--iterations 5] [--pages 1,10,100]
+        [--gate latency,memory,size] [--update-baseline]
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from app.pdf_builder import build_report_pdf
+from app.schemas import GenerateReportRequest
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "render_scaling.json"
+DEFAULT_PAGES = (1, 5, 10, 25, 50, 100)
+TOLERANCES = {"latency": 0.25, "memory": 0.15, "size": 0.05}
+
+# Body lines per page with the medical_report layout (10pt body on A4 with the default margins).
+_LINES_PER_PAGE = 53
+_PAGE_MARKER = re.compile(rb"/Type /Page\b(?!s)")
+
+_SENTENCES = (
+    "Patient reports intermittent chest tightness on exertion, resolving with rest.",
+    "Auscultation: vesicular breath sounds bilaterally, no added sounds.",
+    "BP 128/82 mmHg, HR 76 bpm regular, SpO2 98% on room air.",
+    "Advised to continue current therapy & return if symptoms worsen.",
+    "Hb 13.9 g/dL, WBC 7.2 x10^9/L, PLT 245 x10^9/L; CRP < 5 mg/L.",
+)
+
+
+def synthetic_payload(pages: int) -> GenerateReportRequest:
+    """A report whose text fields fill about `pages` pages (three quarters content, one quarter labs)."""
+    lines = max(1, pages * _LINES_PER_PAGE - 30)  # headings, therapy and footer take ~30 lines
+    content_lines = max(1, lines * 3 // 4)
+    lab_lines = max(1, lines - content_lines)
+    now = datetime(2025, 1, 1, 12, 0)
+    return GenerateReportRequest(
+        patient_name="Benchmark Patient",
+        report={
+            "diagnosis_code": "I20.9",
+            "content": "\n".join(_SENTENCES[i % len(_SENTENCES)] for i in range(content_lines)),
+            "therapy": "Aspirin 100 mg daily.\nAtorvastatin 20 mg at night.",
+            "lab_exams": "\n".join(_SENTENCES[(i + 4) % len(_SENTENCES)] for i in range(lab_lines)),
+            "referral_specialty": "Cardiology",
+            "created_at": now,
+            "updated_at": now,
+        },
+    )
+
+
+def _render(payload: GenerateReportRequest) -> bytes:
+    return build_report_pdf(payload, "AIOC Hospital", "Address", "Phone", True)
+
+
+def measure(pages: int, iterations: int) -> dict:
+    payload = synthetic_payload(pages)
+    pdf = _render(payload)  # warm-up; also the size sample (deterministic output)
+
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        _render(payload)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+
+    tracemalloc.start()
+    _render(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "pages": len(_PAGE_MARKER.findall(pdf)),
+        "latency_p50_ms": round(statistics.median(samples), 2),
+        "latency_p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        "peak_kib": round(peak / 1024, 1),
+        "size_bytes": len(pdf),
+    }
+
+
+_METRICS = (  # (result key, gate name)
+    ("latency_p50_ms", "latency"),
+    ("peak_kib", "memory"),
+    ("size_bytes", "size"),
+)
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], gates: set[str]) -> list[str]:
+    """Print the comparison table; return a description of every gated regression."""
+    failures = []
+    print(f"{'target':>6} | {'pages':>5} | {'p50 ms':>9} | {'Δ':>7} | {'p95 ms':>9} | "
+          f"{'peak KiB':>9} | {'Δ':>7} | {'bytes':>9} | {'Δ':>7}")
+    print("-" * 92)
+    for target, r in results.items():
+        base = baseline.get(target)
+        deltas = {}
+        for key, gate in _METRICS:
+            if not base or not base.get(key):
+                deltas[key] = "   new"
+                continue
+            change = r[key] / base[key] - 1
+            deltas[key] = f"{change:+6.1%}"
+            if gate in gates and change > TOLERANCES[gate]:
+                failures.append(f"{target} pages: {key} {base[key]} -> {r[key]} ({change:+.1%}, "
+                                f"tolerance {TOLERANCES[gate]:.0%})")
+        print(f"{target:>6} | {r['pages']:>5} | {r['latency_p50_ms']:>9.2f} | {deltas['latency_p50_ms']:>7} | "
+              f"{r['latency_p95_ms']:>9.2f} | {r['peak_kib']:>9.1f} | {deltas['peak_kib']:>7} | "
+              f"{r['size_bytes']:>9} | {deltas['size_bytes']:>7}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pages", default=",".join(map(str, DEFAULT_PAGES)),
+                        help="comma-separated target page counts")
+    parser.add_argument("--gate", default="latency,memory,size",
+                        help="metrics that fail the run when they regress (latency, memory, size; empty for none)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    args = parser.parse_args()
+
+    gates = {g for g in args.gate.split(",") if g}
+    unknown = gates - set(TOLERANCES)
+    if unknown:
+        parser.error(f"unknown gate(s): {', '.join(sorted(unknown))}")
+
+    results = {str(p): measure(p, args.iterations) for p in (int(x) for x in args.pages.split(","))}
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = stored.get("results", {})
+    if stored:
+        print(f"baseline: {stored.get('recorded_at', '?')} on {stored.get('machine', '?')}\n")
+    failures = compare(results, baseline, gates)
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "machine": f"{platform.machine()} / Python {platform.python_version()}",
+            "iterations": args.iterations,
+            "results": {**baseline, **results},
+        }, indent=2) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return
+    if failures:
+        print("\nREGRESSIONS:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nno regressions beyond tolerance" if baseline else "\nno baseline yet; run with --update-baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark: per-render setup cost before and after template precompilation.
+
+Compares the setup the builder used to do on every request (getSampleStyleSheet(), three
+ParagraphStyles, fresh header/footer closures) with the precompiled medical_report template,
+and times full renders of a typical report with the compiled template.
+
+    cd aioc-hospital-pdf-service && python -m benchmarks.template_setup [--iterations 500]
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+from app.pdf_builder import REPORT_TEMPLATE, build_report_pdf
+from app.schemas import GenerateReportRequest
+
+
+def _legacy_setup():
+    """The per-request work build_report_pdf did before the compiled template layer."""
+    styles = getSampleStyleSheet()
+    title = ParagraphStyle(name="ReportTitle", parent=styles["Heading1"], fontSize=16, alignment=TA_CENTER, spaceAfter=12)
+    heading = ParagraphStyle(name="SectionHeading", parent=styles["Heading2"], fontSize=11, alignment=TA_CENTER,
+                             spaceBefore=10, spaceAfter=4)
+    body = ParagraphStyle(name="BodyLeft", parent=styles["Normal"], fontSize=10, alignment=TA_LEFT, spaceAfter=6)
+
+    def _draw_header(c, _doc):
+        pass
+
+    def _draw_footer(c, _doc):
+        pass
+
+    def on_first_page(canv, doc):
+        _draw_header(canv, doc)
+        _draw_footer(canv, doc)
+
+    def on_later_pages(canv, doc):
+        _draw_header(canv, doc)
+        _draw_footer(canv, doc)
+
+    return title, heading, body, on_first_page, on_later_pages
+
+
+def _compiled_setup():
+    t = REPORT_TEMPLATE
+    return t.styles["title"], t.styles["heading"], t.styles["body"], t.on_page, t.on_page
+
+
+def _measure(fn, iterations: int) -> tuple[float, float]:
+    """(CPU µs per call, peak KiB allocated per call)."""
+    fn()
+    t0 = time.process_time()
+    for _ in range(iterations):
+        fn()
+    cpu_us = (time.process_time() - t0) / iterations * 1e6
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(iterations):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+    return cpu_us, allocated / iterations / 1024
+
+
+def _sample_payload() -> GenerateReportRequest:
+    now = datetime(2025, 1, 1, 12, 0)
+    return GenerateReportRequest(
+        patient_name="Ana Petrović",
+        report={
+            "diagnosis_code": "J45.9",
+            "content": "Patient presents with intermittent wheezing.\n" * 20,
+            "therapy": "Salbutamol inhaler as needed.",
+            "lab_exams": "CBC within normal limits.\nIgE elevated.",
+            "referral_specialty": "Pulmonology",
+            "created_at": now,
+            "updated_at": now,
+        },
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    legacy_cpu, legacy_kib = _measure(_legacy_setup, args.iterations)
+    compiled_cpu, compiled_kib = _measure(_compiled_setup, args.iterations)
+    print(f"{'setup':<10} | {'CPU µs/render':>14} | {'alloc KiB/render':>16}")
+    print("-" * 46)
+    print(f"{'legacy':<10} | {legacy_cpu:>14.1f} | {legacy_kib:>16.2f}")
+    print(f"{'compiled':<10} | {compiled_cpu:>14.1f} | {compiled_kib:>16.2f}")
+
+    payload = _sample_payload()
+    renders = max(1, args.iterations // 10)
+    build_report_pdf(payload)
+    t0 = time.process_time()
+    for _ in range(renders):
+        build_report_pdf(payload, "AIOC Hospital", "Address", "Phone")
+    per_render_ms = (time.process_time() - t0) / renders * 1000
+    print(f"\nfull render (compiled): {per_render_ms:.2f} ms CPU per document over {renders} renders")
+    print(f"setup share saved per render: {legacy_cpu - compiled_cpu:.1f} µs "
+          f"({(legacy_cpu - compiled_cpu) / (per_render_ms * 10):.1f}% of a render)")
+
+
+if __name__ == "__main__":
+    main()
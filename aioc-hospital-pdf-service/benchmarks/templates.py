@@ -0,0 +1,45 @@
+"""Benchmark: compile cost and per-render latency of every document template.
+
+Compiles each definition in app/templates/ from scratch (the one-off cost paid at import) and
+renders its bundled sample data repeatedly with the compiled template.
+
+    cd aioc-hospital-pdf-service && python -m benchmarks.templates [--iterations 50] [--template NAME]
+"""
+import argparse
+import statistics
+import time
+
+from app.template_engine import CompiledTemplate, load_definitions, templates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--template", help="benchmark only this template")
+    args = parser.parse_args()
+
+    definitions = {d["name"]: d for d in load_definitions()}
+    names = [args.template] if args.template else templates.names()
+
+    print(f"{'template':<20} | {'v':>2} | {'compile ms':>10} | {'render p50 ms':>13} | {'render p95 ms':>13} | {'KiB':>6}")
+    print("-" * 80)
+    for name in names:
+        t0 = time.perf_counter()
+        CompiledTemplate(definitions[name])
+        compile_ms = (time.perf_counter() - t0) * 1000
+
+        template = templates.get(name)
+        pdf = template.render(template.sample, "AIOC Hospital", "Address", "Phone")
+        samples = []
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            template.render(template.sample, "AIOC Hospital", "Address", "Phone")
+            samples.append((time.perf_counter() - t0) * 1000)
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{name:<20} | {template.version:>2} | {compile_ms:>10.2f} | {statistics.median(samples):>13.2f} | "
+              f"{p95:>13.2f} | {len(pdf) / 1024:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,15 @@
-"""JWT-only auth: no users table in this service. Token must include id, sub, role (from login service)."""
+"""JWT-only auth: no users table in this service. Token must include id, sub, role (from login service).
+
+Verified tokens are cached (bounded LRU keyed by the token's SHA-256, each entry dropped at the
+token's `exp`), so a client reusing its token skips the HS256 verify and claim parsing on every
+request after the first. Every request, cached or not, is checked against the revocations
+mirrored from the login service (app/revocations.py).
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+
 import jwt
 from jwt.exceptions import InvalidTokenError
 from fastapi import Depends, HTTPException, status
@@ -6,6 +17,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
 from app.config import settings
+from app.revocations import revocations
 
 bearer_scheme = HTTPBearer()
 
@@ -19,6 +31,49 @@ class CurrentUser(BaseModel):
         frozen = True
 
 
+class _TokenCache:
+    """(CurrentUser, iat) per verified token, until the token expires. Only tokens carrying `exp` are cached."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, CurrentUser, float]] = OrderedDict()  # digest -> (exp, user, iat)
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> tuple[CurrentUser, float] | None:
+        if self.max_entries <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, token: str, user: CurrentUser, issued_at: float, exp) -> None:
+        if self.max_entries <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(exp), user, issued_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = _TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
 def decode_token(token: str) -> dict:
     try:
         return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -33,10 +88,24 @@ def decode_token(token: str) -> dict:
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
 ) -> CurrentUser:
-    payload = decode_token(credentials.credentials)
-    username: str = payload.get("sub")
-    user_id = payload.get("id")
-    role = payload.get("role")
-    if not username or user_id is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return CurrentUser(id=int(user_id), username=username, role=role or "user")
+    token = credentials.credentials
+    cached = token_cache.get(token)
+    if cached is not None:
+        user, issued_at = cached
+    else:
+        payload = decode_token(token)
+        username: str = payload.get("sub")
+        user_id = payload.get("id")
+        role = payload.get("role")
+        if not username or user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        user = CurrentUser(id=int(user_id), username=username, role=role or "user")
+        issued_at = payload.get("iat", 0)  # tokens without iat predate every revocation
+        token_cache.put(token, user, issued_at, payload.get("exp"))
+    if revocations.is_revoked(user.id, issued_at):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
@@ -0,0 +1,168 @@
+"""HTTP clients for management-service (patient lookups) and pdf-service (rendering)."""
+import time
+from collections import OrderedDict
+from threading import Lock
+
+import httpx
+
+from app.config import settings
+from app.middleware import request_id_ctx
+from app.models import Report
+
+# patient_id -> (internal patient payload, fetched_at); LRU-bounded, entries expire after PATIENT_CACHE_TTL.
+_patient_cache: OrderedDict[int, tuple[dict, float]] = OrderedDict()
+_cache_lock = Lock()
+
+
+def _get_cached(pid: int) -> dict | None:
+    with _cache_lock:
+        entry = _patient_cache.get(pid)
+        if entry and time.monotonic() - entry[1] < settings.PATIENT_CACHE_TTL:
+            _patient_cache.move_to_end(pid)
+            return entry[0]
+    return None
+
+
+def _put_cached(data: dict[int, dict]) -> None:
+    now = time.monotonic()
+    with _cache_lock:
+        for pid, val in data.items():
+            _patient_cache[pid] = (val, now)
+            _patient_cache.move_to_end(pid)
+        while len(_patient_cache) > settings.PATIENT_CACHE_MAX_ENTRIES:
+            _patient_cache.popitem(last=False)
+
+
+def internal_headers() -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if settings.INTERNAL_API_KEY:
+        headers["X-Internal-Key"] = settings.INTERNAL_API_KEY
+    rid = request_id_ctx.get("")
+    if rid:
+        headers["X-Request-ID"] = rid
+    return headers
+
+
+def fetch_patient(patient_id: int, fresh: bool = False) -> dict | None:
+    """Fetch patient from management service internal API (cached). Returns None on error or 404.
+
+    fresh=True bypasses the cache read, for checks such as is_active that must not be up to
+    PATIENT_CACHE_TTL stale; the fetched entry still refreshes the cache."""
+    cached = None if fresh else _get_cached(patient_id)
+    if cached is not None:
+        return cached
+    url = f"{settings.MANAGEMENT_SERVICE_URL.rstrip('/')}/internal/patients/{patient_id}"
+    try:
+        with httpx.Client(timeout=10.0) as client:
+            r = client.get(url, headers=internal_headers())
+            r.raise_for_status()
+            data = r.json()
+    except httpx.HTTPError:
+        return None
+    _put_cached({patient_id: data})
+    return data
+
+
+def fetch_patients(patient_ids: list[int]) -> dict[int, dict]:
+    """Resolve many patient IDs: cache first, then one /internal/patients/batch call for the rest.
+    Missing or unreachable patients are simply absent from the result."""
+    result: dict[int, dict] = {}
+    missing: list[int] = []
+    for pid in set(patient_ids):
+        cached = _get_cached(pid)
+        if cached is not None:
+            result[pid] = cached
+        else:
+            missing.append(pid)
+    if not missing:
+        return result
+
+    url = f"{settings.MANAGEMENT_SERVICE_URL.rstrip('/')}/internal/patients/batch"
+    try:
+        with httpx.Client(timeout=10.0) as client:
+            r = client.post(url, json={"ids": missing}, headers=internal_headers())
+            r.raise_for_status()
+            data = r.json()
+    except httpx.HTTPError:
+        return result  # return whatever we got from cache
+
+    fetched = {p["id"]: p for p in data}
+    _put_cached(fetched)
+    result.update(fetched)
+    return result
+
+
+def patient_display_name(data: dict) -> str:
+    return f"{data['first_name']} {data['last_name']}"
+
+
+def fetch_patient_name(patient_id: int) -> str:
+    """Resolve patient_id to display name via management service."""
+    data = fetch_patient(patient_id)
+    if data:
+        return patient_display_name(data)
+    return f"Patient {patient_id}"
+
+
+def pdf_payload(report: Report, patient_name: str) -> dict:
+    return {
+        "patient_name": patient_name,
+        "report": {
+            "diagnosis_code": report.diagnosis_code,
+            "content": report.content,
+            "therapy": report.therapy,
+            "lab_exams": report.lab_exams,
+            "referral_specialty": report.referral_specialty,
+            "created_at": report.created_at.isoformat() if report.created_at else None,
+            "updated_at": report.updated_at.isoformat() if report.updated_at else None,
+        },
+    }
+
+
+def _pdf_request_headers() -> dict[str, str]:
+    pdf_headers: dict[str, str] = {}
+    rid = request_id_ctx.get("")
+    if rid:
+        pdf_headers["X-Request-ID"] = rid
+    return pdf_headers
+
+
+def _pdf_generate_url() -> str:
+    return f"{settings.PDF_SERVICE_URL.rstrip('/')}/api/generate/report"
+
+
+def render_pdf(payload: dict) -> bytes:
+    """Render via pdf-service. Raises httpx.HTTPError on failure."""
+    with httpx.Client(timeout=30.0) as client:
+        r = client.post(_pdf_generate_url(), json=payload, headers=_pdf_request_headers())
+        r.raise_for_status()
+        return r.content
+
+
+async def render_pdf_async(client: httpx.AsyncClient, payload: dict) -> bytes:
+    """Render via pdf-service on a shared async client. Raises httpx.HTTPError on failure."""
+    r = await client.post(_pdf_generate_url(), json=payload, headers=_pdf_request_headers())
+    r.raise_for_status()
+    return r.content
+
+
+async def open_pdf_stream(payload: dict) -> tuple[httpx.AsyncClient, httpx.Response]:
+    """Start a render on pdf-service and return once the status line is in, body unread.
+
+    The caller must aclose() both the response and the client. Raises httpx.HTTPError on failure
+    (everything is closed in that case).
+    """
+    client = httpx.AsyncClient(timeout=30.0)
+    try:
+        request = client.build_request("POST", _pdf_generate_url(), json=payload, headers=_pdf_request_headers())
+        response = await client.send(request, stream=True)
+    except httpx.HTTPError:
+        await client.aclose()
+        raise
+    try:
+        response.raise_for_status()
+    except httpx.HTTPError:
+        await response.aclose()
+        await client.aclose()
+        raise
+    return client, response
@@ -0,0 +1,99 @@
+"""Streamed ZIP export of report PDFs.
+
+PDFs are rendered (or read from the PDF cache) with at most PDF_EXPORT_CONCURRENCY in flight
+and written into the archive as soon as each one is ready. The ZIP is produced on the fly into
+a small drain buffer, so memory is bounded by the in-flight PDFs, never the whole archive.
+Cache reads/writes and ZIP writes are blocking, so they run in the threadpool.
+"""
+import asyncio
+import io
+import logging
+import zipfile
+from typing import AsyncIterator
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from app.clients import pdf_payload, render_pdf_async
+from app.config import settings
+from app.models import Report
+from app.pdf_cache import cache_key, pdf_cache
+
+logger = logging.getLogger(__name__)
+
+
+class _ZipSink(io.RawIOBase):
+    """Non-seekable write target for ZipFile; bytes are collected until drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _report_pdf(client: httpx.AsyncClient, report: Report, patient_name: str) -> bytes:
+    key = cache_key(report, patient_name)
+    pdf = await run_in_threadpool(pdf_cache.get, key)
+    if pdf is None:
+        pdf = await render_pdf_async(client, pdf_payload(report, patient_name))
+        await run_in_threadpool(pdf_cache.put, key, pdf)
+    return pdf
+
+
+def _entry_name(report: Report) -> str:
+    day = report.created_at.strftime("%Y-%m-%d") if report.created_at else "undated"
+    return f"report-{report.id}-{day}.pdf"
+
+
+async def stream_reports_zip(reports: list[Report], patient_name: str) -> AsyncIterator[bytes]:
+    sink = _ZipSink()
+    failed: list[str] = []
+    # PDFs are already deflate-compressed internally; storing them avoids wasted CPU.
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as zf:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            queue = iter(reports)
+            in_flight: dict[asyncio.Task, Report] = {}
+
+            def _schedule() -> None:
+                while len(in_flight) < max(1, settings.PDF_EXPORT_CONCURRENCY):
+                    report = next(queue, None)
+                    if report is None:
+                        return
+                    in_flight[asyncio.create_task(_report_pdf(client, report, patient_name))] = report
+
+            _schedule()
+            try:
+                while in_flight:
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        report = in_flight.pop(task)
+                        try:
+                            pdf = task.result()
+                        except httpx.HTTPError:
+                            logger.warning("Export: rendering report %s failed", report.id, exc_info=True)
+                            failed.append(f"report {report.id}: PDF service unavailable")
+                        else:
+                            await run_in_threadpool(zf.writestr, _entry_name(report), pdf)
+                    _schedule()
+                    data = sink.drain()
+                    if data:
+                        yield data
+            finally:
+                # Client went away (or a render raised): stop the remaining renders and wait for
+                # them, so none outlives the HTTP client they use.
+                for task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+        if failed:
+            await run_in_threadpool(zf.writestr, "errors.txt", "\n".join(failed) + "\n")
+    yield sink.drain()
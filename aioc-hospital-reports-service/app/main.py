@@ -10,7 +10,9 @@ from sqlalchemy import text
 from app.config import settings
 from app.database import get_db
 from app.middleware import RequestIDMiddleware
-from app.routes import reports
+from app.revocations import revocations
+from app.prerender import prerender_queue
+from app.routes import analytics, reports, search
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,7 +21,11 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting AIOC Hospital Reports Service…")
+    revocations.start()
+    prerender_queue.start()
     yield
+    await revocations.stop()
+    prerender_queue.stop()
 
 
 app = FastAPI(
@@ -39,6 +45,8 @@ app.add_middleware(
 )
 
 app.include_router(reports.router)
+app.include_router(search.router)
+app.include_router(analytics.router)
 
 
 @app.get("/health")
@@ -46,7 +54,7 @@ def health(db: Session = Depends(get_db)):
     try:
         r = db.execute(text("SELECT current_database()"))
         db_name = r.scalar()
-        return {"status": "ok", "database": db_name}
+        return {"status": "ok", "database": db_name, **revocations.stats()}
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
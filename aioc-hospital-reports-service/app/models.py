@@ -1,8 +1,22 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import (
+    Boolean, Column, Computed, Date, DateTime, ForeignKey,
+    Integer, String, Text, UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
+
 from app.database import Base
 
+# Must match migration 0002; generated by Postgres, never written by the app.
+_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(diagnosis_code, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(content, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(therapy, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(lab_exams, '')), 'C')"
+)
+
 
 class Report(Base):
     __tablename__ = "reports"
@@ -17,3 +31,31 @@ class Report(Base):
     created_at         = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at         = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     created_by_id      = Column(Integer, nullable=True)  # from login service (no FK)
+    search_vector      = deferred(Column(TSVECTOR, Computed(_SEARCH_VECTOR_SQL, persisted=True)))
+
+
+class ReportDiagnosisRollup(Base):
+    """Report counts per (month, diagnosis code, referral specialty), maintained by app.rollups.
+
+    Missing codes / specialties are stored as '' so they can be part of the primary key.
+    """
+    __tablename__ = "report_diagnosis_rollups"
+
+    month              = Column(Date, primary_key=True)  # first day of the report's created_at month
+    diagnosis_code     = Column(String, primary_key=True)
+    referral_specialty = Column(String, primary_key=True)
+    report_count       = Column(Integer, nullable=False, default=0)
+
+
+class ReportRevision(Base):
+    """One entry of a report's edit history; `data` is a full snapshot or a delta (see app.revisions)."""
+    __tablename__ = "report_revisions"
+    __table_args__ = (UniqueConstraint("report_id", "revision", name="uq_report_revisions_report_revision"),)
+
+    id            = Column(Integer, primary_key=True)
+    report_id     = Column(Integer, ForeignKey("reports.id", ondelete="CASCADE"), nullable=False)
+    revision      = Column(Integer, nullable=False)  # 1-based, per report
+    is_snapshot   = Column(Boolean, nullable=False, default=False)
+    data          = Column(JSONB, nullable=False)
+    created_at    = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_by_id = Column(Integer, nullable=True)  # from login service (no FK)
@@ -0,0 +1,146 @@
+"""Content-addressed on-disk cache of rendered report PDFs.
+
+A report's PDF only changes when the report (updated_at), the patient's display name or the
+PDF template changes, so the cache key is a digest of exactly those inputs. Entries are plain
+files named by the key; a size-bounded LRU index (rebuilt from file mtimes on startup) evicts
+the least recently served files once PDF_CACHE_MAX_BYTES is exceeded.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+from typing import BinaryIO
+
+from app.config import settings
+from app.models import Report
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(report: Report, patient_name: str) -> str:
+    updated = report.updated_at.isoformat() if report.updated_at else ""
+    raw = f"{report.id}|{updated}|{patient_name}|{settings.PDF_TEMPLATE_VERSION}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class PdfCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()  # key -> size, oldest first
+        self._total = 0
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _load(self) -> None:
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".pdf"):
+                st = entry.stat()
+                found.append((st.st_mtime, entry.name[:-4], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total += size
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used files until under max_bytes. Caller holds the lock (or is __init__)."""
+        while self._total > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def path_for(self, key: str) -> str | None:
+        """Path of a cached PDF (marking it recently used), or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                size = self._entries.pop(key, None)
+                if size is not None:
+                    self._total -= size
+            return None
+        return path
+
+    def open_file(self, key: str) -> BinaryIO | None:
+        """Open a cached PDF for reading; the handle stays valid even if the entry is evicted meanwhile."""
+        path = self.path_for(key)
+        if path is None:
+            return None
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+    def get(self, key: str) -> bytes | None:
+        f = self.open_file(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def temp_file(self) -> tuple[BinaryIO, str]:
+        """Writable temp file inside the cache directory, to be passed to commit() or discard()."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        return os.fdopen(fd, "wb"), tmp
+
+    @staticmethod
+    def discard(tmp: str) -> None:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+    def commit(self, key: str, tmp: str) -> None:
+        """Atomically move a completed temp file into the cache under key."""
+        try:
+            size = os.path.getsize(tmp)
+            if size > self.max_bytes:
+                self.discard(tmp)
+                return
+            os.replace(tmp, self._path(key))
+        except OSError:
+            logger.warning("Could not write PDF cache entry %s", key, exc_info=True)
+            self.discard(tmp)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total -= previous
+            self._entries[key] = size
+            self._total += size
+            self._evict()
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        try:
+            f, tmp = self.temp_file()
+        except OSError:
+            logger.warning("Could not write PDF cache entry %s", key, exc_info=True)
+            return
+        try:
+            with f:
+                f.write(data)
+        except OSError:
+            logger.warning("Could not write PDF cache entry %s", key, exc_info=True)
+            self.discard(tmp)
+            return
+        self.commit(key, tmp)
+
+
+pdf_cache = PdfCache(settings.PDF_CACHE_DIR, settings.PDF_CACHE_MAX_BYTES)
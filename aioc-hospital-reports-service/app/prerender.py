@@ -0,0 +1,126 @@
+"""Background pre-rendering of report PDFs into the disk cache.
+
+create_report / update_report enqueue the report id after commit. Jobs only carry the id and
+the updated_at they were queued for: a worker always renders the report as it currently is in
+the database, so a newer save simply replaces a still-pending job for the same report
+(superseded versions are never rendered). A fixed number of worker threads drain the queue;
+when PDF_PRERENDER_MAX_PENDING reports are waiting, new ones are skipped and rendered on demand.
+"""
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from threading import Condition, Thread
+
+import httpx
+
+from app.clients import fetch_patient_name, pdf_payload, render_pdf
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Report
+from app.pdf_cache import cache_key, pdf_cache
+
+logger = logging.getLogger(__name__)
+
+_STATE_LIMIT = 10_000  # finished job states remembered for the status endpoint
+
+
+class PrerenderQueue:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending: OrderedDict[int, datetime] = OrderedDict()  # report_id -> updated_at queued
+        self._state: OrderedDict[int, tuple[str, datetime]] = OrderedDict()  # report_id -> (state, updated_at)
+        self._cond = Condition()
+        self._threads: list[Thread] = []
+        self._stopping = False
+
+    def start(self) -> None:
+        self._stopping = False
+        for i in range(self.workers):
+            t = Thread(target=self._run, name=f"pdf-prerender-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads.clear()
+
+    def _set_state(self, report_id: int, state: str, updated_at: datetime) -> None:
+        self._state[report_id] = (state, updated_at)
+        self._state.move_to_end(report_id)
+        while len(self._state) > _STATE_LIMIT:
+            self._state.popitem(last=False)
+
+    def enqueue(self, report: Report) -> bool:
+        """Queue a render of the report's current version. Returns False if disabled or full."""
+        if not self._threads:
+            return False
+        with self._cond:
+            if report.id not in self._pending and len(self._pending) >= self.max_pending:
+                logger.warning("PDF prerender queue full; report %s will render on demand", report.id)
+                return False
+            self._pending[report.id] = report.updated_at  # replaces a superseded pending version
+            self._set_state(report.id, "pending", report.updated_at)
+            self._cond.notify()
+        return True
+
+    def discard(self, report_id: int) -> None:
+        with self._cond:
+            self._pending.pop(report_id, None)
+            self._state.pop(report_id, None)
+
+    def status(self, report: Report) -> str | None:
+        """pending / rendering / ready / failed for this exact version, or None if not tracked."""
+        with self._cond:
+            entry = self._state.get(report.id)
+        if entry and entry[1] == report.updated_at:
+            return entry[0]
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                report_id, updated_at = self._pending.popitem(last=False)
+                self._set_state(report_id, "rendering", updated_at)
+            try:
+                result = "ready" if self._render(report_id) else None
+            except (httpx.HTTPError, OSError):
+                logger.warning("PDF prerender failed for report %s", report_id, exc_info=True)
+                result = "failed"
+            except Exception:
+                # Anything else (database error, bad payload) fails this job only; the worker lives on.
+                logger.error("PDF prerender crashed for report %s", report_id, exc_info=True)
+                result = "failed"
+            with self._cond:
+                current = self._state.get(report_id)
+                # A newer save re-queued the report meanwhile; leave its "pending" state alone.
+                if current and current[1] == updated_at:
+                    if result is None:
+                        self._state.pop(report_id, None)
+                    else:
+                        self._set_state(report_id, result, updated_at)
+
+    def _render(self, report_id: int) -> bool:
+        db = SessionLocal()
+        try:
+            report = db.query(Report).filter(Report.id == report_id).first()
+        finally:
+            db.close()
+        if report is None:
+            return False
+        patient_name = fetch_patient_name(report.patient_id)
+        key = cache_key(report, patient_name)
+        if pdf_cache.path_for(key) is None:
+            pdf_cache.put(key, render_pdf(pdf_payload(report, patient_name)))
+        return True
+
+
+prerender_queue = PrerenderQueue(settings.PDF_PRERENDER_WORKERS, settings.PDF_PRERENDER_MAX_PENDING)
@@ -0,0 +1,134 @@
+"""Report revision history stored as deltas.
+
+Every create / update appends a ReportRevision. Most revisions hold only a line-level diff of
+the fields that changed against the previous revision; every SNAPSHOT_INTERVAL-th revision
+(1, 11, 21, …) holds the full text, so reconstructing any version replays at most
+SNAPSHOT_INTERVAL - 1 deltas on top of the nearest snapshot.
+
+Delta format, per changed field:
+    {"ops": [[start_line, end_line, "replacement text"], ...]}   edits to the previous text
+    {"set": value}                                               field set to/from NULL
+"""
+from difflib import SequenceMatcher
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import Report, ReportRevision
+
+TRACKED_FIELDS = ("diagnosis_code", "content", "therapy", "lab_exams", "referral_specialty")
+SNAPSHOT_INTERVAL = 10
+
+
+def field_values(report: Report) -> dict[str, str | None]:
+    return {f: getattr(report, f) for f in TRACKED_FIELDS}
+
+
+def _diff(old: str, new: str) -> list[list]:
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    return [
+        [i1, i2, "".join(b[j1:j2])]
+        for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _patch(old: str, ops: list[list]) -> str:
+    lines = old.splitlines(keepends=True)
+    # Apply from the end so earlier line numbers stay valid.
+    for i1, i2, text in reversed(ops):
+        lines[i1:i2] = [text] if text else []
+    return "".join(lines)
+
+
+def make_delta(old: dict[str, str | None], new: dict[str, str | None]) -> dict[str, dict]:
+    delta: dict[str, dict] = {}
+    for field in TRACKED_FIELDS:
+        before, after = old.get(field), new.get(field)
+        if before == after:
+            continue
+        if before is None or after is None:
+            delta[field] = {"set": after}
+        else:
+            delta[field] = {"ops": _diff(before, after)}
+    return delta
+
+
+def apply_delta(values: dict[str, str | None], delta: dict[str, dict]) -> dict[str, str | None]:
+    out = dict(values)
+    for field, change in delta.items():
+        out[field] = change["set"] if "set" in change else _patch(out[field] or "", change["ops"])
+    return out
+
+
+def _latest_revision(db: Session, report_id: int) -> int:
+    return db.query(func.max(ReportRevision.revision)).filter(ReportRevision.report_id == report_id).scalar() or 0
+
+
+def record_revision(
+    db: Session,
+    report: Report,
+    previous: dict[str, str | None] | None,
+    user_id: int | None,
+) -> ReportRevision | None:
+    """Append a revision for the report's current values (call before commit).
+
+    `previous` is the field state before this change (None on create). Reports created before
+    revisions existed get their pre-update state recorded as revision 1 first.
+    """
+    current = field_values(report)
+    latest = _latest_revision(db, report.id)
+    if latest == 0 and previous is not None:
+        db.add(ReportRevision(
+            report_id=report.id, revision=1, is_snapshot=True, data=previous,
+            created_at=report.created_at, created_by_id=report.created_by_id,
+        ))
+        latest = 1
+    if previous is not None and previous == current:
+        return None
+
+    revision = latest + 1
+    is_snapshot = previous is None or revision % SNAPSHOT_INTERVAL == 1
+    entry = ReportRevision(
+        report_id=report.id,
+        revision=revision,
+        is_snapshot=is_snapshot,
+        data=current if is_snapshot else make_delta(previous, current),
+        created_at=report.updated_at,
+        created_by_id=user_id,
+    )
+    db.add(entry)
+    return entry
+
+
+def reconstruct(db: Session, report_id: int, revision: int) -> dict[str, str | None] | None:
+    """Field values as of `revision`, or None if that revision does not exist."""
+    base = (
+        db.query(ReportRevision)
+        .filter(
+            ReportRevision.report_id == report_id,
+            ReportRevision.revision <= revision,
+            ReportRevision.is_snapshot == True,
+        )
+        .order_by(ReportRevision.revision.desc())
+        .first()
+    )
+    if base is None:
+        return None
+    deltas = (
+        db.query(ReportRevision)
+        .filter(
+            ReportRevision.report_id == report_id,
+            ReportRevision.revision > base.revision,
+            ReportRevision.revision <= revision,
+        )
+        .order_by(ReportRevision.revision)
+        .all()
+    )
+    if base.revision + len(deltas) != revision:
+        return None
+    values = dict(base.data)
+    for entry in deltas:
+        values = dict(entry.data) if entry.is_snapshot else apply_delta(values, entry.data)
+    return values
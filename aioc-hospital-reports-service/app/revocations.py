@@ -0,0 +1,89 @@
+"""Token revocations mirrored from the login service.
+
+Access tokens are verified locally (app/auth.py), so a deactivated user's token would otherwise
+keep working here until it expires. The login service publishes revocations — "tokens of user X
+issued at or before T are invalid" — on GET /internal/revocations; a background task polls it
+every REVOCATION_POLL_SECONDS, asking only for what was added since the previous poll, and
+get_current_user checks each request against the in-memory copy (one dict lookup, no network).
+
+Only revocations younger than the access-token lifetime are kept: older ones can no longer
+match an unexpired token. If the login service is unreachable the last known list stays in use
+and polling continues; /health reports the age of the last successful sync.
+"""
+import asyncio
+import logging
+import time
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    def __init__(self, feed_url: str, poll_seconds: float):
+        self.feed_url = feed_url
+        self.poll_seconds = poll_seconds
+        self._revoked: dict[int, float] = {}  # user_id -> revoked_at (unix time); replaced, never mutated
+        self._as_of: float | None = None
+        self._synced_at: float | None = None  # monotonic
+        self._task: asyncio.Task | None = None
+
+    def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        revoked_at = self._revoked.get(user_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def apply(self, feed: dict) -> None:
+        """Merge one feed response; drops revocations older than the feed's horizon."""
+        revoked = dict(self._revoked)
+        for entry in feed["revocations"]:
+            user_id, revoked_at = int(entry["user_id"]), float(entry["revoked_at"])
+            revoked[user_id] = max(revoked_at, revoked.get(user_id, revoked_at))
+        oldest = feed["as_of"] - feed["horizon_seconds"]
+        self._revoked = {u: t for u, t in revoked.items() if t >= oldest}
+        self._as_of = feed["as_of"]
+        self._synced_at = time.monotonic()
+
+    async def sync(self, client: httpx.AsyncClient) -> None:
+        params = {"since": self._as_of} if self._as_of is not None else {}
+        headers = {"X-Internal-Key": settings.INTERNAL_API_KEY} if settings.INTERNAL_API_KEY else {}
+        r = await client.get(self.feed_url, params=params, headers=headers)
+        r.raise_for_status()
+        self.apply(r.json())
+
+    async def _poll(self) -> None:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            while True:
+                try:
+                    await self.sync(client)
+                except (httpx.HTTPError, KeyError, ValueError):
+                    logger.warning("Token revocation sync from %s failed", self.feed_url, exc_info=True)
+                except Exception:
+                    # An unexpected feed body (or a bug) must not end the task: checks would fail open.
+                    logger.error("Token revocation sync from %s crashed", self.feed_url, exc_info=True)
+                await asyncio.sleep(self.poll_seconds)
+
+    def start(self) -> None:
+        if self.feed_url:
+            self._task = asyncio.create_task(self._poll(), name="token-revocations")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "revoked_users": len(self._revoked),
+            "revocations_synced_seconds_ago": (
+                round(time.monotonic() - self._synced_at, 1) if self._synced_at is not None else None
+            ),
+        }
+
+
+revocations = RevocationList(
+    feed_url=f"{settings.LOGIN_SERVICE_URL.rstrip('/')}/internal/revocations" if settings.LOGIN_SERVICE_URL else "",
+    poll_seconds=settings.REVOCATION_POLL_SECONDS,
+)
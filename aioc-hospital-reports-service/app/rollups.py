@@ -0,0 +1,46 @@
+"""Incremental diagnosis rollups: every report create / update / delete adjusts one or two
+counters in report_diagnosis_rollups inside the same transaction, so analytics never scan reports."""
+from datetime import date, datetime
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Report, ReportDiagnosisRollup
+
+# Trimmed from codes and specialties; must match btrim(x, E' \t\r\n') in the 0003 backfill,
+# or a value with a tab or newline would land in a different row than the backfill put it in.
+TRIM_CHARS = " \t\r\n"
+
+
+def rollup_key(created_at: datetime | None, diagnosis_code: str | None, referral_specialty: str | None) -> tuple[date, str, str]:
+    created = created_at or datetime.utcnow()
+    return (
+        date(created.year, created.month, 1),
+        (diagnosis_code or "").strip(TRIM_CHARS).upper(),
+        (referral_specialty or "").strip(TRIM_CHARS),
+    )
+
+
+def report_key(report: Report) -> tuple[date, str, str]:
+    return rollup_key(report.created_at, report.diagnosis_code, report.referral_specialty)
+
+
+def apply_delta(db: Session, key: tuple[date, str, str], delta: int) -> None:
+    """Upsert-increment one rollup row. Not committed; runs in the caller's transaction."""
+    month, code, specialty = key
+    stmt = insert(ReportDiagnosisRollup).values(
+        month=month, diagnosis_code=code, referral_specialty=specialty, report_count=delta,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["month", "diagnosis_code", "referral_specialty"],
+        set_={"report_count": ReportDiagnosisRollup.report_count + delta},
+    )
+    db.execute(stmt)
+
+
+def move(db: Session, old_key: tuple[date, str, str], new_key: tuple[date, str, str]) -> None:
+    """Shift one report between rollup buckets (no-op when the bucket did not change)."""
+    if old_key == new_key:
+        return
+    apply_delta(db, old_key, -1)
+    apply_delta(db, new_key, 1)
@@ -0,0 +1,61 @@
+"""Diagnosis analytics served from report_diagnosis_rollups (never scans reports)."""
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import ReportDiagnosisRollup
+from app.rollups import TRIM_CHARS
+from app.schemas import DiagnosisRollupItem, DiagnosisRollupResponse
+from app.auth import get_current_user, CurrentUser
+
+router = APIRouter(prefix="/api/reports/analytics", tags=["analytics"])
+
+
+@router.get("/diagnoses", response_model=DiagnosisRollupResponse)
+def diagnosis_frequency(
+    from_month: date | None = Query(default=None, alias="from", description="Any day in the first month"),
+    to_month: date | None = Query(default=None, alias="to", description="Any day in the last month"),
+    diagnosis_code: str | None = Query(default=None),
+    referral_specialty: str | None = Query(default=None),
+    group_by: str = Query(default="month", pattern="^(month|total)$", description="'total' sums over the range"),
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    """Report counts by month × diagnosis code × referral specialty."""
+    r = ReportDiagnosisRollup
+    filters = [r.report_count > 0]
+    if from_month is not None:
+        filters.append(r.month >= from_month.replace(day=1))
+    if to_month is not None:
+        filters.append(r.month <= to_month.replace(day=1))
+    if diagnosis_code is not None:
+        filters.append(r.diagnosis_code == diagnosis_code.strip(TRIM_CHARS).upper())
+    if referral_specialty is not None:
+        filters.append(r.referral_specialty == referral_specialty.strip(TRIM_CHARS))
+
+    count = func.sum(r.report_count).label("report_count")
+    if group_by == "total":
+        month = func.min(r.month).label("month")
+        q = db.query(month, r.diagnosis_code, r.referral_specialty, count).group_by(
+            r.diagnosis_code, r.referral_specialty
+        )
+        q = q.filter(*filters).order_by(count.desc())
+    else:
+        q = db.query(r.month, r.diagnosis_code, r.referral_specialty, count).group_by(
+            r.month, r.diagnosis_code, r.referral_specialty
+        )
+        q = q.filter(*filters).order_by(r.month, count.desc())
+
+    items = [
+        DiagnosisRollupItem(
+            month=row.month,
+            diagnosis_code=row.diagnosis_code or None,
+            referral_specialty=row.referral_specialty or None,
+            report_count=row.report_count,
+        )
+        for row in q.all()
+    ]
+    return DiagnosisRollupResponse(items=items, total_reports=sum(i.report_count for i in items))
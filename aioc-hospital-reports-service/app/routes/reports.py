@@ -1,51 +1,37 @@
+import os
+from typing import AsyncIterator, BinaryIO, Iterator
+
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.config import settings
+from app.clients import fetch_patient, fetch_patient_name, open_pdf_stream, pdf_payload
 from app.database import get_db
-from app.middleware import request_id_ctx
-from app.models import Report
-from app.schemas import ReportCreate, ReportUpdate, ReportResponse, ReportListResponse
+from app.export import stream_reports_zip
+from app.models import Report, ReportRevision
+from app.pdf_cache import cache_key, pdf_cache
+from app.prerender import prerender_queue
+from app import revisions, rollups
+from app.schemas import (
+    ReportCreate, ReportUpdate, ReportResponse, ReportListResponse, ReportPdfStatusResponse,
+    ReportExportRequest, ReportSummaryResponse, ReportSummaryListResponse,
+    ReportRevisionSummary, ReportRevisionListResponse, ReportRevisionResponse,
+)
 from app.auth import get_current_user, CurrentUser
 
 router = APIRouter(prefix="/api/patients", tags=["reports"])
 
 
-def _internal_headers() -> dict[str, str]:
-    headers: dict[str, str] = {}
-    if settings.INTERNAL_API_KEY:
-        headers["X-Internal-Key"] = settings.INTERNAL_API_KEY
-    rid = request_id_ctx.get("")
-    if rid:
-        headers["X-Request-ID"] = rid
-    return headers
-
-
-def _fetch_patient(patient_id: int) -> dict | None:
-    """Fetch patient from management service internal API. Returns None on error or 404."""
-    url = f"{settings.MANAGEMENT_SERVICE_URL.rstrip('/')}/internal/patients/{patient_id}"
-    try:
-        with httpx.Client(timeout=10.0) as client:
-            r = client.get(url, headers=_internal_headers())
-            r.raise_for_status()
-            return r.json()
-    except httpx.HTTPError:
-        return None
-
+SNIPPET_LENGTH = 200
 
-def _fetch_patient_name(patient_id: int) -> str:
-    """Resolve patient_id to display name via management service."""
-    data = _fetch_patient(patient_id)
-    if data:
-        return f"{data['first_name']} {data['last_name']}"
-    return f"Patient {patient_id}"
 
-
-@router.get("/{patient_id}/reports", response_model=ReportListResponse)
+@router.get("/{patient_id}/reports", response_model=ReportListResponse | ReportSummaryListResponse)
 def list_reports(
     patient_id: int,
+    fields: str = Query(default="full", pattern="^(full|summary)$", description="'summary' omits report text except a snippet"),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=100),
     db: Session = Depends(get_db),
@@ -53,6 +39,30 @@ def list_reports(
 ):
     q = db.query(Report).filter(Report.patient_id == patient_id)
     total = q.count()
+    if fields == "summary":
+        # Only metadata columns plus a SQL-side prefix of content are read and sent; one extra
+        # character tells whether the snippet was cut.
+        rows = (
+            db.query(
+                Report.id, Report.patient_id, Report.diagnosis_code, Report.referral_specialty,
+                Report.created_at, Report.updated_at, Report.created_by_id,
+                func.substr(Report.content, 1, SNIPPET_LENGTH + 1).label("snippet"),
+            )
+            .filter(Report.patient_id == patient_id)
+            .order_by(Report.updated_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        items = [
+            ReportSummaryResponse(
+                **{k: v for k, v in row._mapping.items() if k != "snippet"},
+                snippet=row.snippet[:SNIPPET_LENGTH],
+                snippet_truncated=len(row.snippet) > SNIPPET_LENGTH,
+            )
+            for row in rows
+        ]
+        return ReportSummaryListResponse(items=items, total=total)
     items = q.order_by(Report.updated_at.desc()).offset(skip).limit(limit).all()
     return ReportListResponse(items=items, total=total)
 
@@ -64,7 +74,8 @@ def create_report(
     db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    patient = _fetch_patient(patient_id)
+    # Read through to management: a cached entry could still show a just-deactivated patient as active.
+    patient = fetch_patient(patient_id, fresh=True)
     if not patient:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
     if not patient.get("is_active", True):
@@ -82,11 +93,45 @@ def create_report(
         created_by_id=current_user.id,
     )
     db.add(report)
+    db.flush()  # assigns id / created_at for the rollup bucket and revision 1
+    rollups.apply_delta(db, rollups.report_key(report), 1)
+    revisions.record_revision(db, report, None, current_user.id)
     db.commit()
     db.refresh(report)
+    prerender_queue.enqueue(report)
     return report
 
 
+def _load_reports_for_export(
+    db: Session, patient_id: int, report_ids: list[int] | None
+) -> tuple[list[Report], str]:
+    q = db.query(Report).filter(Report.patient_id == patient_id)
+    if report_ids is not None:
+        q = q.filter(Report.id.in_(report_ids))
+    reports = q.order_by(Report.created_at).all()
+    if not reports:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No reports found")
+    return reports, fetch_patient_name(patient_id)
+
+
+@router.post("/{patient_id}/reports/export")
+async def export_reports_zip(
+    patient_id: int,
+    body: ReportExportRequest | None = None,
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    """Download all (or the selected) reports of a patient as a ZIP of PDFs, streamed as it is built."""
+    report_ids = body.report_ids if body else None
+    reports, patient_name = await run_in_threadpool(_load_reports_for_export, db, patient_id, report_ids)
+    filename = f"patient-{patient_id}-reports.zip"
+    return StreamingResponse(
+        stream_reports_zip(reports, patient_name),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/{patient_id}/reports/{report_id}", response_model=ReportResponse)
 def get_report(
     patient_id: int,
@@ -106,15 +151,28 @@ def update_report(
     report_id: int,
     body: ReportUpdate,
     db: Session = Depends(get_db),
-    _: CurrentUser = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    report = db.query(Report).filter(Report.id == report_id, Report.patient_id == patient_id).first()
+    # Row lock: concurrent edits of one report take turns, so each sees the previous edit's values
+    # and revision numbers are assigned one at a time.
+    report = (
+        db.query(Report)
+        .filter(Report.id == report_id, Report.patient_id == patient_id)
+        .with_for_update()
+        .first()
+    )
     if not report:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+    old_bucket = rollups.report_key(report)
+    previous = revisions.field_values(report)
     for k, v in body.model_dump(exclude_unset=True).items():
         setattr(report, k, v)
+    db.flush()  # bumps updated_at, which stamps the revision
+    rollups.move(db, old_bucket, rollups.report_key(report))
+    revisions.record_revision(db, report, previous, current_user.id)
     db.commit()
     db.refresh(report)
+    prerender_queue.enqueue(report)
     return report
 
 
@@ -128,55 +186,179 @@ def delete_report(
     report = db.query(Report).filter(Report.id == report_id, Report.patient_id == patient_id).first()
     if not report:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+    rollups.apply_delta(db, rollups.report_key(report), -1)
     db.delete(report)
     db.commit()
+    prerender_queue.discard(report_id)
 
 
-@router.get("/{patient_id}/reports/{report_id}/pdf")
-def get_report_pdf(
+def _get_report_or_404(db: Session, patient_id: int, report_id: int) -> Report:
+    report = db.query(Report).filter(Report.id == report_id, Report.patient_id == patient_id).first()
+    if not report:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+    return report
+
+
+@router.get("/{patient_id}/reports/{report_id}/revisions", response_model=ReportRevisionListResponse)
+def list_report_revisions(
+    patient_id: int,
+    report_id: int,
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    """Edit history, newest first. Reports never edited since history was introduced have none."""
+    _get_report_or_404(db, patient_id, report_id)
+    rows = (
+        db.query(ReportRevision)
+        .filter(ReportRevision.report_id == report_id)
+        .order_by(ReportRevision.revision.desc())
+        .all()
+    )
+    items = [
+        ReportRevisionSummary(
+            revision=r.revision,
+            is_snapshot=r.is_snapshot,
+            changed_fields=list(revisions.TRACKED_FIELDS) if r.is_snapshot else sorted(r.data),
+            created_at=r.created_at,
+            created_by_id=r.created_by_id,
+        )
+        for r in rows
+    ]
+    return ReportRevisionListResponse(items=items, total=len(items))
+
+
+@router.get("/{patient_id}/reports/{report_id}/revisions/{revision}", response_model=ReportRevisionResponse)
+def get_report_revision(
+    patient_id: int,
+    report_id: int,
+    revision: int,
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    """Reconstruct the report text as of a revision (nearest snapshot + following deltas)."""
+    _get_report_or_404(db, patient_id, report_id)
+    entry = (
+        db.query(ReportRevision)
+        .filter(ReportRevision.report_id == report_id, ReportRevision.revision == revision)
+        .first()
+    )
+    values = revisions.reconstruct(db, report_id, revision) if entry else None
+    if values is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Revision not found")
+    return ReportRevisionResponse(
+        report_id=report_id,
+        revision=revision,
+        created_at=entry.created_at,
+        created_by_id=entry.created_by_id,
+        **values,
+    )
+
+
+@router.get("/{patient_id}/reports/{report_id}/pdf/status", response_model=ReportPdfStatusResponse)
+def get_report_pdf_status(
     patient_id: int,
     report_id: int,
     db: Session = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
+    """Whether the PDF for the report's current version has been pre-rendered."""
+    report = db.query(Report).filter(Report.id == report_id, Report.patient_id == patient_id).first()
+    if not report:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+    state = prerender_queue.status(report)
+    if state is None:
+        key = cache_key(report, fetch_patient_name(patient_id))
+        state = "ready" if pdf_cache.path_for(key) else "none"
+    return ReportPdfStatusResponse(report_id=report.id, updated_at=report.updated_at, status=state)
+
+
+_PDF_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_cached_pdf(f: BinaryIO) -> Iterator[bytes]:
+    with f:
+        while chunk := f.read(_PDF_CHUNK_SIZE):
+            yield chunk
+
+
+def _open_cached_pdf(key: str) -> tuple[BinaryIO, int] | None:
+    f = pdf_cache.open_file(key)
+    if f is None:
+        return None
+    return f, os.fstat(f.fileno()).st_size
+
+
+def _finish_cache_file(cache_file: BinaryIO, key: str, tmp: str, complete: bool) -> None:
+    cache_file.close()
+    if complete:
+        pdf_cache.commit(key, tmp)
+    else:
+        pdf_cache.discard(tmp)
+
+
+async def _proxy_pdf(client: httpx.AsyncClient, upstream: httpx.Response, key: str) -> AsyncIterator[bytes]:
+    """Relay the pdf-service body chunk by chunk, teeing it into the disk cache.
+
+    Cache file I/O runs in the threadpool so a slow disk never stalls the event loop."""
+    cache_file, tmp = await run_in_threadpool(pdf_cache.temp_file)
+    complete = False
+    try:
+        async for chunk in upstream.aiter_bytes(_PDF_CHUNK_SIZE):
+            await run_in_threadpool(cache_file.write, chunk)
+            yield chunk
+        complete = True
+    finally:
+        await upstream.aclose()
+        await client.aclose()
+        await run_in_threadpool(_finish_cache_file, cache_file, key, tmp, complete)
+
+
+def _load_report_for_pdf(db: Session, patient_id: int, report_id: int) -> tuple[Report, str]:
     report = db.query(Report).filter(
         Report.id == report_id, Report.patient_id == patient_id
     ).first()
     if not report:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
-    patient_name = _fetch_patient_name(patient_id)
-    payload = {
-        "patient_name": patient_name,
-        "report": {
-            "diagnosis_code": report.diagnosis_code,
-            "content": report.content,
-            "therapy": report.therapy,
-            "lab_exams": report.lab_exams,
-            "referral_specialty": report.referral_specialty,
-            "created_at": report.created_at.isoformat() if report.created_at else None,
-            "updated_at": report.updated_at.isoformat() if report.updated_at else None,
-        },
+    return report, fetch_patient_name(patient_id)
+
+
+@router.get("/{patient_id}/reports/{report_id}/pdf")
+async def get_report_pdf(
+    patient_id: int,
+    report_id: int,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    # DB and management-service lookups are blocking; keep them off the event loop.
+    report, patient_name = await run_in_threadpool(_load_report_for_pdf, db, patient_id, report_id)
+    key = cache_key(report, patient_name)
+    etag = f'"{key}"'
+    cache_headers = {
+        "ETag": etag,
+        # Private: reports are patient data. no-cache: browsers revalidate, and get a 304 while unchanged.
+        "Cache-Control": "private, no-cache",
     }
-    pdf_headers: dict[str, str] = {}
-    rid = request_id_ctx.get("")
-    if rid:
-        pdf_headers["X-Request-ID"] = rid
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    filename = f"report-{report_id}.pdf"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', **cache_headers}
+
+    cached = await run_in_threadpool(_open_cached_pdf, key)
+    if cached is not None:
+        cached_file, size = cached
+        headers["Content-Length"] = str(size)
+        # A sync iterator: StreamingResponse reads it in the threadpool.
+        return StreamingResponse(_iter_cached_pdf(cached_file), media_type="application/pdf", headers=headers)
+
     try:
-        with httpx.Client(timeout=30.0) as client:
-            r = client.post(
-                f"{settings.PDF_SERVICE_URL.rstrip('/')}/api/generate/report",
-                json=payload,
-                headers=pdf_headers,
-            )
-            r.raise_for_status()
+        client, upstream = await open_pdf_stream(pdf_payload(report, patient_name))
     except httpx.HTTPError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="PDF service unavailable",
         ) from e
-    filename = f"report-{report_id}.pdf"
-    return Response(
-        content=r.content,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+    if "content-length" in upstream.headers:
+        headers["Content-Length"] = upstream.headers["content-length"]
+    return StreamingResponse(_proxy_pdf(client, upstream, key), media_type="application/pdf", headers=headers)
@@ -0,0 +1,63 @@
+"""Full-text search over report text (content, therapy, lab exams, diagnosis code)."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.clients import fetch_patients, patient_display_name
+from app.database import get_db
+from app.models import Report
+from app.schemas import ReportSearchHit, ReportSearchResponse
+from app.auth import get_current_user, CurrentUser
+
+router = APIRouter(prefix="/api/reports", tags=["search"])
+
+# Plain-text markers rather than HTML so report text never has to be trusted as markup.
+_HEADLINE_OPTIONS = "StartSel=«, StopSel=», MaxFragments=3, MinWords=5, MaxWords=18, FragmentDelimiter= … "
+
+
+@router.get("/search", response_model=ReportSearchResponse)
+def search_reports(
+    q: str = Query(..., min_length=1, description="Web-search syntax: words, \"phrases\", OR, -exclude"),
+    patient_id: int | None = Query(default=None),
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    tsquery = func.websearch_to_tsquery("simple", q)
+    match = Report.search_vector.op("@@")(tsquery)
+    filters = [match]
+    if patient_id is not None:
+        filters.append(Report.patient_id == patient_id)
+
+    total = db.scalar(select(func.count()).select_from(Report).where(*filters))
+
+    # Rank and page on the GIN-indexed vector first; ts_headline re-parses the text, so it
+    # only runs for the rows of the returned page.
+    rank = func.ts_rank_cd(Report.search_vector, tsquery).label("rank")
+    page = (
+        select(Report.id, rank)
+        .where(*filters)
+        .order_by(rank.desc(), Report.updated_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    document = func.concat_ws(" … ", Report.diagnosis_code, Report.content, Report.therapy, Report.lab_exams)
+    rows = db.execute(
+        select(
+            Report.id, Report.patient_id, Report.diagnosis_code, Report.referral_specialty,
+            Report.created_at, Report.updated_at, page.c.rank,
+            func.ts_headline("simple", document, tsquery, _HEADLINE_OPTIONS).label("highlight"),
+        )
+        .join(page, page.c.id == Report.id)
+        .order_by(page.c.rank.desc(), Report.updated_at.desc())
+    ).all()
+    patients = fetch_patients([row.patient_id for row in rows])
+    items = [
+        ReportSearchHit.model_validate(row, from_attributes=True).model_copy(
+            update={"patient_name": patient_display_name(patients[row.patient_id]) if row.patient_id in patients else None}
+        )
+        for row in rows
+    ]
+    return ReportSearchResponse(items=items, total=total or 0)
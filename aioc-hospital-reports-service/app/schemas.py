@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel
 
 
@@ -36,3 +36,85 @@ class ReportResponse(BaseModel):
 class ReportListResponse(BaseModel):
     items: list[ReportResponse]
     total: int
+
+
+class ReportSummaryResponse(BaseModel):
+    """List projection: metadata plus the start of content, no therapy / lab exams."""
+    id: int
+    patient_id: int
+    diagnosis_code: str | None
+    referral_specialty: str | None
+    created_at: datetime
+    updated_at: datetime
+    created_by_id: int | None
+    snippet: str
+    snippet_truncated: bool
+
+
+class ReportSummaryListResponse(BaseModel):
+    items: list[ReportSummaryResponse]
+    total: int
+
+
+class ReportPdfStatusResponse(BaseModel):
+    report_id: int
+    updated_at: datetime
+    status: str  # none | pending | rendering | ready | failed
+
+
+class ReportExportRequest(BaseModel):
+    report_ids: list[int] | None = None  # None = every report of the patient
+
+
+class ReportSearchHit(BaseModel):
+    id: int
+    patient_id: int
+    diagnosis_code: str | None
+    referral_specialty: str | None
+    created_at: datetime
+    updated_at: datetime
+    rank: float
+    highlight: str  # matched fragments, terms wrapped in « »
+    patient_name: str | None = None
+
+
+class ReportSearchResponse(BaseModel):
+    items: list[ReportSearchHit]
+    total: int
+
+
+class DiagnosisRollupItem(BaseModel):
+    month: date
+    diagnosis_code: str | None
+    referral_specialty: str | None
+    report_count: int
+
+
+class DiagnosisRollupResponse(BaseModel):
+    items: list[DiagnosisRollupItem]
+    total_reports: int
+
+
+class ReportRevisionSummary(BaseModel):
+    revision: int
+    is_snapshot: bool
+    changed_fields: list[str]
+    created_at: datetime
+    created_by_id: int | None
+
+
+class ReportRevisionListResponse(BaseModel):
+    items: list[ReportRevisionSummary]
+    total: int
+
+
+class ReportRevisionResponse(BaseModel):
+    report_id: int
+    revision: int
+    created_at: datetime
+    created_by_id: int | None
+    diagnosis_code: str | None
+    content: str
+    therapy: str | None
+    lab_exams: str | None
+    referral_specialty: str | None
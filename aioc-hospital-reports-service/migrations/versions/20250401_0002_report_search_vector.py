@@ -0,0 +1,40 @@
+"""full-text search vector on reports
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-04-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # 'simple' (no stemming) because reports are written in Serbian as well as English.
+    # Weights: diagnosis code A, main content B, therapy / lab exams C.
+    conn.execute(sa.text("""
+        ALTER TABLE reports ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(diagnosis_code, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(content, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(therapy, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(lab_exams, '')), 'C')
+        ) STORED
+    """))
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_reports_search_vector ON reports USING GIN (search_vector)"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP INDEX IF EXISTS ix_reports_search_vector"))
+    conn.execute(sa.text("ALTER TABLE reports DROP COLUMN IF EXISTS search_vector"))
@@ -0,0 +1,47 @@
+"""report diagnosis rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-04-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("""
+        CREATE TABLE IF NOT EXISTS report_diagnosis_rollups (
+            month              DATE    NOT NULL,
+            diagnosis_code     VARCHAR NOT NULL,
+            referral_specialty VARCHAR NOT NULL,
+            report_count       INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, diagnosis_code, referral_specialty)
+        )
+    """))
+    # One-off backfill from existing reports; afterwards the app maintains counts incrementally.
+    # btrim's character set matches app.rollups.TRIM_CHARS (plain trim() only strips spaces).
+    conn.execute(sa.text("""
+        INSERT INTO report_diagnosis_rollups (month, diagnosis_code, referral_specialty, report_count)
+        SELECT date_trunc('month', created_at)::date,
+               upper(btrim(coalesce(diagnosis_code, ''), E' \\t\\r\\n')),
+               btrim(coalesce(referral_specialty, ''), E' \\t\\r\\n'),
+               count(*)
+        FROM reports
+        GROUP BY 1, 2, 3
+        ON CONFLICT (month, diagnosis_code, referral_specialty)
+        DO UPDATE SET report_count = EXCLUDED.report_count
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP TABLE IF EXISTS report_diagnosis_rollups"))
@@ -0,0 +1,38 @@
+"""report revision history
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-04-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("""
+        CREATE TABLE IF NOT EXISTS report_revisions (
+            id            SERIAL PRIMARY KEY,
+            report_id     INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+            revision      INTEGER NOT NULL,
+            is_snapshot   BOOLEAN NOT NULL DEFAULT FALSE,
+            data          JSONB   NOT NULL,
+            created_at    TIMESTAMP NOT NULL DEFAULT NOW(),
+            created_by_id INTEGER,
+            CONSTRAINT uq_report_revisions_report_revision UNIQUE (report_id, revision)
+        )
+    """))
+    # Existing reports get revision 1 lazily, on their first update (app.revisions.record_revision).
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP TABLE IF EXISTS report_revisions"))
@@ -10,6 +10,7 @@ from sqlalchemy import text
 from app.config import settings
 from app.database import get_db
 from app.middleware import RequestIDMiddleware
+from app.revocations import revocations
 from app.routes import doctors, appointments
 
 logging.basicConfig(level=logging.INFO)
@@ -19,7 +20,9 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting AIOC Hospital Scheduling Service…")
+    revocations.start()
     yield
+    await revocations.stop()
 
 
 app = FastAPI(
@@ -47,7 +50,7 @@ def health(db: Session = Depends(get_db)):
     try:
         r = db.execute(text("SELECT current_database()"))
         db_name = r.scalar()
-        return {"status": "ok", "database": db_name}
+        return {"status": "ok", "database": db_name, **revocations.stats()}
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
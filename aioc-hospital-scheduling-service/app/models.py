@@ -2,8 +2,8 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, Enum, ForeignKey,
-    Integer, String, Text,
+    Boolean, Column, DateTime, Enum, ForeignKey, Index,
+    Integer, String, Text, text,
 )
 from sqlalchemy.orm import relationship
 
@@ -19,6 +19,10 @@ class AppointmentStatus(str, enum.Enum):
 
 class Doctor(Base):
     __tablename__ = "doctors"
+    __table_args__ = (
+        # list_doctors?is_active=true orders the active rows by display_name
+        Index("ix_doctors_active_display_name", "display_name", postgresql_where=text("is_active")),
+    )
 
     id            = Column(Integer, primary_key=True, index=True)
     user_id       = Column(Integer, nullable=False, unique=True)  # from login service (no FK)
@@ -0,0 +1,31 @@
+"""partial index on active doctors by display_name
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-03-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # list_doctors?is_active=true orders by display_name. (Lookups by user_id are
+    # already served by the unique index on doctors.user_id.)
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_doctors_active_display_name "
+        "ON doctors (display_name) WHERE is_active"
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP INDEX IF EXISTS ix_doctors_active_display_name"))
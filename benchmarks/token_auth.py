@@ -0,0 +1,96 @@
+"""Benchmark: per-request JWT auth overhead in the downstream services, with and without the token cache.
+
+Calls a service's get_current_user directly (the work FastAPI does for every authenticated
+request, minus routing) for a pool of login-service-shaped tokens, reused the way clients reuse
+their 8-hour token, and reports the mean cost per request:
+
+    uncached   jwt.decode (HS256 verify + claim parsing) and CurrentUser on every request
+    cached     steady state with app.auth.token_cache warm (SHA-256 of the token + LRU lookup)
+    cold       first request per token with the cache on (decode + cache insert)
+
+The auth module is identical in management, scheduling and reports; --service picks which copy
+to import. No database is needed.
+
+    python benchmarks/token_auth.py [--service management] [--tokens 500] [--requests 100000]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load_auth(service: str):
+    sys.path.insert(0, str(ROOT / f"aioc-hospital-{service}-service"))
+    from app import auth  # noqa: E402 — the service directory is only importable once on sys.path
+    from app.config import settings  # noqa: E402
+    return auth, settings
+
+
+def _tokens(jwt, settings, count: int) -> list[str]:
+    expire = datetime.now(timezone.utc) + timedelta(hours=8)
+    return [
+        jwt.encode(
+            {"sub": f"user{i}", "id": i, "role": "admin" if i % 10 == 0 else "user", "exp": expire},
+            settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM,
+        )
+        for i in range(count)
+    ]
+
+
+def _per_request_us(fn, sequence, repeat: int) -> float:
+    """Median over `repeat` passes of the mean microseconds per call."""
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for item in sequence:
+            fn(item)
+        runs.append((time.perf_counter() - t0) / len(sequence) * 1e6)
+    return statistics.median(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--service", choices=("management", "scheduling", "reports"), default="management")
+    parser.add_argument("--tokens", type=int, default=500, help="distinct tokens (logged-in clients)")
+    parser.add_argument("--requests", type=int, default=100_000, help="requests per pass")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    auth, settings = _load_auth(args.service)
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    credentials = [
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=t)
+        for t in _tokens(auth.jwt, settings, args.tokens)
+    ]
+    rng = random.Random(0)
+    sequence = [rng.choice(credentials) for _ in range(args.requests)]
+    cache = auth.token_cache
+    size = cache.max_entries or args.tokens
+
+    cache.max_entries = 0
+    uncached = _per_request_us(auth.get_current_user, sequence, args.repeat)
+
+    cache.max_entries = size
+    colds = []
+    for _ in range(args.repeat):
+        cache._entries.clear()
+        colds.append(_per_request_us(auth.get_current_user, credentials, 1))
+    cold = statistics.median(colds)
+    cached = _per_request_us(auth.get_current_user, sequence, args.repeat)
+
+    print(f"{args.service}-service get_current_user, {args.tokens} tokens, {args.requests} requests/pass")
+    print(f"{'mode':<10} | {'µs/request':>10} | {'speedup':>8}")
+    print("-" * 34)
+    for mode, value in (("uncached", uncached), ("cold", cold), ("cached", cached)):
+        print(f"{mode:<10} | {value:>10.2f} | {uncached / value:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()